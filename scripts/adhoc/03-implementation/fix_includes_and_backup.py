@@ -6,6 +6,161 @@ import argparse
 import datetime
 import re
 import sys
+import json
+import string
+import hashlib
+from collections import deque
+
+# Common include path errors, matched with one alternation so each file is
+# scanned once: repeated core/ prefixes collapse to one, and bare polycall/
+# and ffi/ includes move under core/
+INCLUDE_FIXES = {
+    "polycall/": "core/polycall/",
+    "ffi/": "core/ffi/"
+}
+INCLUDE_FIX_PATTERN = re.compile(r'#include "(core/(?:core/)+|polycall/|ffi/)')
+
+def _fix_include_prefix(match):
+    prefix = match.group(1)
+    return '#include "' + INCLUDE_FIXES.get(prefix, "core/")
+
+# Digests of files already left in their fixed form, so later runs can skip them
+FIX_STATE_FILE = os.path.join(".polycall-cache", "fix_includes.json")
+
+# Identifies the fix rules the recorded state was produced with
+FIX_RULES_DIGEST = hashlib.blake2b(
+    repr((INCLUDE_FIX_PATTERN.pattern, sorted(INCLUDE_FIXES.items()))).encode()
+).hexdigest()
+
+def content_digest(content):
+    """Return the BLAKE2b digest of text content"""
+    return hashlib.blake2b(content.encode('utf-8', errors='replace')).hexdigest()
+
+def load_fix_state(repo_path):
+    """
+    Load the per-file state recorded by previous fix_includes runs; state
+    recorded under different fix rules is discarded
+    """
+    try:
+        with open(os.path.join(repo_path, FIX_STATE_FILE), 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    
+    if not isinstance(state, dict) or state.get("rules") != FIX_RULES_DIGEST:
+        return {}
+    return state.get("files", {})
+
+def save_fix_state(repo_path, state):
+    """Persist per-file state for the next fix_includes run"""
+    state_path = os.path.join(repo_path, FIX_STATE_FILE)
+    try:
+        os.makedirs(os.path.dirname(state_path), exist_ok=True)
+        with open(state_path + ".tmp", 'w', encoding='utf-8') as f:
+            json.dump({"rules": FIX_RULES_DIGEST, "files": state}, f)
+        os.replace(state_path + ".tmp", state_path)
+    except OSError as e:
+        print(f"Warning: Could not save fix state: {e}")
+
+def write_file(file_path, content):
+    """
+    Replace a file's content through a temporary file and os.replace, so a
+    partially written file is never left in place
+    """
+    temp_path = file_path + ".tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    shutil.copymode(file_path, temp_path)
+    os.replace(temp_path, file_path)
+
+def snapshot_tree(source_dir, target_dir):
+    """
+    Copy a directory tree for a backup. GNU cp with --reflink=auto shares
+    data blocks copy-on-write where the filesystem supports it and copies
+    normally elsewhere; without it, fall back to shutil.copytree.
+    """
+    if sys.platform.startswith("linux") and shutil.which("cp"):
+        os.makedirs(target_dir, exist_ok=True)
+        result = subprocess.run(
+            ["cp", "-a", "--reflink=auto", os.path.join(source_dir, "."), target_dir],
+            stderr=subprocess.PIPE
+        )
+        if result.returncode == 0:
+            return
+    shutil.copytree(source_dir, target_dir, dirs_exist_ok=True)
+
+# Skeleton for headers created by sync_headers, parsed once
+HEADER_TEMPLATE = string.Template("""/**
+ * @file ${module_name}.h
+ * @brief Header file for ${module_name} module
+ * @author Nnamdi Okpala (OBINexusComputing)
+ *
+ * LibPolyCall - A Program First Data-Oriented Program Interface Implementation
+ */
+
+#ifndef ${guard_name}
+#define ${guard_name}
+
+#include <stddef.h>
+#include <stdbool.h>
+#include <stdint.h>
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+/* Function declarations */
+
+#ifdef __cplusplus
+}
+#endif
+
+#endif /* ${guard_name} */
+""")
+
+# Compiler diagnostic for a missing include, and how much build output to keep
+MISSING_INCLUDE_PATTERN = re.compile(r'fatal error: ([^:]+): No such file or directory')
+BUILD_LOG_TAIL_LINES = 200
+
+# Maps a module directory to its header guard prefix
+GUARD_TRANSLATION = str.maketrans("/", "_")
+
+# Written into a backup once it is complete. Only backups carrying it are
+# used as rsync --link-dest bases: they hold real copies, whereas backups
+# from older versions of this script may hardlink the working tree.
+BACKUP_MARKER = ".polycall-backup"
+
+def find_previous_backup(backup_root, exclude):
+    """Return the most recent complete backup directory other than exclude, or None"""
+    try:
+        candidates = [entry.path for entry in os.scandir(backup_root)
+                      if entry.is_dir() and entry.path != exclude
+                      and os.path.isfile(os.path.join(entry.path, BACKUP_MARKER))]
+    except OSError:
+        return None
+    
+    # Backup names end in their %Y%m%d_%H%M%S timestamp, optionally after a commit hash
+    return max(candidates, key=lambda path: os.path.basename(path)[-15:], default=None)
+
+def rsync_link_dest(rsync, previous_dir, source_dir, target_dir):
+    """
+    Copy source_dir to target_dir with rsync, hardlinking files unchanged
+    since previous_dir. Returns False if rsync fails, after removing its
+    partial output: copying over it would write through the hardlinks into
+    the previous backup.
+    """
+    try:
+        result = subprocess.run(
+            [rsync, "-a", f"--link-dest={os.path.abspath(previous_dir)}",
+             source_dir + os.sep, target_dir + os.sep],
+            stderr=subprocess.PIPE
+        )
+        if result.returncode == 0:
+            return True
+    except OSError:
+        pass
+    shutil.rmtree(target_dir, ignore_errors=True)
+    return False
 
 def create_backup(repo_path, commit_hash=None):
     """Create a timestamped backup with optional commit reference"""
@@ -17,28 +172,69 @@ def create_backup(repo_path, commit_hash=None):
         backup_dir = os.path.join(repo_path, "backup", timestamp)
     
     os.makedirs(backup_dir, exist_ok=True)
+    previous_backup = find_previous_backup(os.path.dirname(backup_dir), backup_dir)
+    rsync = shutil.which("rsync")
     
-    # Backup src and include directories
+    # Backup src and include directories. Against a previous backup, rsync
+    # hardlinks unchanged files to it and copies only what changed; otherwise,
+    # or if rsync fails, the tree is copied (or reflinked). The working tree's own files are
+    # never linked, so tools rewriting them in place cannot alter a backup.
     for directory in ["src", "include"]:
         source_dir = os.path.join(repo_path, directory)
         if os.path.exists(source_dir):
             target_dir = os.path.join(backup_dir, directory)
-            shutil.copytree(source_dir, target_dir, dirs_exist_ok=True)
+            previous_dir = previous_backup and os.path.join(previous_backup, directory)
+            if not (rsync and previous_dir and os.path.isdir(previous_dir)
+                    and rsync_link_dest(rsync, previous_dir, source_dir, target_dir)):
+                snapshot_tree(source_dir, target_dir)
             print(f"Backed up {directory} to {target_dir}")
     
+    with open(os.path.join(backup_dir, BACKUP_MARKER), 'w', encoding='utf-8') as f:
+        f.write(timestamp + "\n")
+    
     return backup_dir
 
-def fix_includes(repo_path):
-    """Fix include path issues throughout the codebase"""
-    print("Fixing include paths...")
-    
-    # Phase 1: Find all .c files and ensure they include their corresponding .h file
+def collect_sources(repo_path):
+    """Walk src once and return its (.c files, .h files)"""
     c_files = []
+    h_files = []
     for root, _, files in os.walk(os.path.join(repo_path, "src")):
         for file in files:
             if file.endswith(".c"):
                 c_files.append(os.path.join(root, file))
+            elif file.endswith(".h"):
+                h_files.append(os.path.join(root, file))
+    
+    return c_files, h_files
+
+def collect_changed_sources(repo_path, base):
+    """Return the (.c files, .h files) under src changed between the merge base of base and HEAD"""
+    output = subprocess.check_output(
+        ["git", "-C", repo_path, "diff", "--name-only", "--relative", "--diff-filter=d",
+         f"{base}...HEAD", "--", "src/*.c", "src/*.h"],
+        text=True
+    )
+    
+    c_files = []
+    h_files = []
+    for rel_path in output.splitlines():
+        file_path = os.path.join(repo_path, rel_path)
+        if not os.path.isfile(file_path):
+            continue
+        if rel_path.endswith(".c"):
+            c_files.append(file_path)
+        else:
+            h_files.append(file_path)
+    
+    return c_files, h_files
+
+def fix_includes(repo_path, sources=None):
+    """Fix include path issues throughout the codebase"""
+    print("Fixing include paths...")
+    
+    c_files, h_files = sources or collect_sources(repo_path)
     
+    # Phase 1: Ensure each .c file includes its corresponding .h file
     for c_file in c_files:
         # Extract module name and relative path
         rel_path = os.path.relpath(c_file, os.path.join(repo_path, "src"))
@@ -62,37 +258,39 @@ def fix_includes(repo_path):
         if header_include not in content:
             # Add the include at the top of the file
             new_content = f'{header_include}\n{content}'
-            with open(c_file, 'w', encoding='utf-8') as f:
-                f.write(new_content)
+            write_file(c_file, new_content)
             print(f"Added {header_include} to {rel_path}")
     
-    # Phase 2: Fix common include path errors
-    for root, _, files in os.walk(os.path.join(repo_path, "src")):
-        for file in files:
-            if file.endswith((".c", ".h")):
-                file_path = os.path.join(root, file)
-                
-                with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
-                    content = f.read()
-                
-                # Fix duplicate core prefixes and other common errors
-                replacements = [
-                    (r'#include "core/core/', '#include "core/'),
-                    (r'#include "core/core/core/', '#include "core/'),
-                    (r'#include "polycall/', '#include "core/polycall/'),
-                    (r'#include "ffi/', '#include "core/ffi/')
-                ]
-                
-                modified = False
-                for pattern, replacement in replacements:
-                    if re.search(pattern, content):
-                        content = re.sub(pattern, replacement, content)
-                        modified = True
-                
-                if modified:
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        f.write(content)
-                    print(f"Fixed include paths in {os.path.relpath(file_path, repo_path)}")
+    # Phase 2: Fix common include path errors. The fixes are idempotent, so
+    # a file still in the state recorded by an earlier run needs no work.
+    # Entries for files not visited this run (e.g. with --only-changed) are
+    # kept.
+    fix_state = load_fix_state(repo_path)
+    new_state = dict(fix_state)
+    for file_path in c_files + h_files:
+        rel_path = os.path.relpath(file_path, repo_path)
+        entry = fix_state.get(rel_path)
+        st = os.stat(file_path)
+        if entry and entry["stat"] == [st.st_mtime_ns, st.st_size]:
+            continue
+        
+        with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+            content = f.read()
+        digest = content_digest(content)
+        
+        if not entry or entry["digest"] != digest:
+            # Fix duplicate core prefixes and other common errors
+            content, count = INCLUDE_FIX_PATTERN.subn(_fix_include_prefix, content)
+            
+            if count:
+                write_file(file_path, content)
+                digest = content_digest(content)
+                st = os.stat(file_path)
+                print(f"Fixed include paths in {rel_path}")
+        
+        new_state[rel_path] = {"stat": [st.st_mtime_ns, st.st_size], "digest": digest}
+    
+    save_fix_state(repo_path, new_state)
     
     return True
 
@@ -134,16 +332,13 @@ def verify_includes(repo_path):
     
     return success
 
-def sync_headers(repo_path):
+def sync_headers(repo_path, c_files=None):
     """Ensure all C files have corresponding headers"""
     print("Synchronizing headers...")
     
-    # Find all C files and check for corresponding headers
-    c_files = []
-    for root, _, files in os.walk(os.path.join(repo_path, "src")):
-        for file in files:
-            if file.endswith(".c"):
-                c_files.append(os.path.join(root, file))
+    # Check each C file for a corresponding header
+    if c_files is None:
+        c_files, _ = collect_sources(repo_path)
     
     for c_file in c_files:
         # Get relative path and module name
@@ -160,39 +355,11 @@ def sync_headers(repo_path):
             os.makedirs(os.path.dirname(header_path), exist_ok=True)
             
             # Generate header guard name
-            guard_name = f"{module_dir.replace('/', '_').upper()}_{module_name.upper()}_H"
+            guard_name = f"{module_dir.translate(GUARD_TRANSLATION).upper()}_{module_name.upper()}_H"
             
-            # Create header content
-            header_content = f"""/**
- * @file {module_name}.h
- * @brief Header file for {module_name} module
- * @author Nnamdi Okpala (OBINexusComputing)
- *
- * LibPolyCall - A Program First Data-Oriented Program Interface Implementation
- */
-
-#ifndef {guard_name}
-#define {guard_name}
-
-#include <stddef.h>
-#include <stdbool.h>
-#include <stdint.h>
-
-#ifdef __cplusplus
-extern "C" {{
-#endif
-
-/* Function declarations */
-
-#ifdef __cplusplus
-}}
-#endif
-
-#endif /* {guard_name} */
-"""
             # Write header file
-            with open(header_path, 'w', encoding='utf-8') as f:
-                f.write(header_content)
+            with open(header_path, 'w', encoding='utf-8', newline='\n') as f:
+                f.write(HEADER_TEMPLATE.substitute(module_name=module_name, guard_name=guard_name))
             
             print(f"Created header {os.path.relpath(header_path, repo_path)}")
     
@@ -203,23 +370,38 @@ def run_compilation_test(repo_path):
     print("Running compilation test...")
     
     try:
-        result = subprocess.run(
+        # Stream the build's error output: keep missing-include errors as they
+        # appear and only the tail of the log, however long the build runs
+        process = subprocess.Popen(
             ["cmake", "--build", ".", "--target", "polycall_static"],
             cwd=repo_path,
-            stdout=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
             stderr=subprocess.PIPE,
             text=True
         )
         
-        if result.returncode == 0:
+        include_errors = []
+        tail = deque(maxlen=BUILD_LOG_TAIL_LINES)
+        line_count = 0
+        for line in process.stderr:
+            line_count += 1
+            tail.append(line)
+            match = MISSING_INCLUDE_PATTERN.search(line)
+            if match:
+                include_errors.append(match.group(1))
+        process.stderr.close()
+        returncode = process.wait()
+        
+        if returncode == 0:
             print("Compilation successful!")
             return True
         else:
             print("Compilation failed with errors:")
-            print(result.stderr)
+            if line_count > len(tail):
+                print(f"... ({line_count - len(tail)} earlier lines omitted)")
+            print("".join(tail))
             
-            # Extract include errors for diagnosis
-            include_errors = re.findall(r'fatal error: ([^:]+): No such file or directory', result.stderr)
+            # Report include errors for diagnosis
             if include_errors:
                 print("\nMissing includes:")
                 for error in include_errors:
@@ -237,6 +419,7 @@ def main():
     parser.add_argument("--commit", help="Optional commit hash for backup reference")
     parser.add_argument("--skip-backup", action="store_true", help="Skip creating backup")
     parser.add_argument("--test", action="store_true", help="Run compilation test after fixes")
+    parser.add_argument("--only-changed", metavar="BASE", help="Only process sources changed between the merge base of BASE and HEAD")
     
     args = parser.parse_args()
     
@@ -250,13 +433,23 @@ def main():
         backup_dir = create_backup(args.repo_path, args.commit)
         print(f"Backup created at {backup_dir}")
     
+    # Walk src once; neither fixing nor syncing adds or removes files under it
+    sources = None
+    if args.only_changed:
+        try:
+            sources = collect_changed_sources(args.repo_path, args.only_changed)
+            print(f"Processing {sum(map(len, sources))} files changed since {args.only_changed}")
+        except (OSError, subprocess.CalledProcessError) as e:
+            print(f"Warning: Cannot list changes since {args.only_changed}, processing all files: {e}")
+    c_files, h_files = sources or collect_sources(args.repo_path)
+    
     # Apply fixes
-    fix_result = fix_includes(args.repo_path)
+    fix_result = fix_includes(args.repo_path, (c_files, h_files))
     if not fix_result:
         print("Warning: Include fixes may not have been fully applied")
     
     # Sync headers
-    sync_result = sync_headers(args.repo_path)
+    sync_result = sync_headers(args.repo_path, c_files)
     if not sync_result:
         print("Warning: Header synchronization may not have been fully completed")
     
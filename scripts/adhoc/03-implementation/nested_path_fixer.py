@@ -16,7 +16,10 @@ import re
 import sys
 import argparse
 import logging
+import functools
+import concurrent.futures
 from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
 
 # Configure logging
 logging.basicConfig(
@@ -25,14 +28,116 @@ logging.basicConfig(
 )
 logger = logging.getLogger('libpolycall-nested-path-fixer')
 
+# Include statements rewritten by the fixer; captures the include path
+INCLUDE_PATTERN = re.compile(r'#include\s+"([^"]+)"')
+
+def iter_files(root: str, suffixes: Tuple[str, ...]) -> Iterator[str]:
+    """
+    Yield the paths of files under root ending in one of suffixes, using
+    os.scandir so file types come from the directory listing.
+    """
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.endswith(suffixes) and entry.is_file():
+                        yield entry.path
+        except OSError as e:
+            logger.warning(f"Cannot scan {directory}: {e}")
+
+# Specific pattern replacements for nested paths, applied in order
+NESTED_PATTERNS = (
+    # Fix nested core/polycall/core paths with module-specific replacements
+    (r'polycall/core/polycall/core/auth/([^"]+)', r'polycall/core/auth/\1'),
+    (r'polycall/core/polycall/core/config/([^"]+)', r'polycall/core/config/\1'),
+    (r'polycall/core/polycall/core/edge/([^"]+)', r'polycall/core/edge/\1'),
+    (r'polycall/core/polycall/core/ffi/([^"]+)', r'polycall/core/ffi/\1'),
+    (r'polycall/core/polycall/core/micro/([^"]+)', r'polycall/core/micro/\1'),
+    (r'polycall/core/polycall/core/network/([^"]+)', r'polycall/core/network/\1'),
+    (r'polycall/core/polycall/core/protocol/([^"]+)', r'polycall/core/protocol/\1'),
+    (r'polycall/core/polycall/core/telemetry/([^"]+)', r'polycall/core/telemetry/\1'),
+    
+    # Generic pattern for core/polycall/core module
+    (r'polycall/core/polycall/core/([^/]+)/([^"]+)', r'polycall/core/\1/\2'),
+    
+    # Fix cases where polycall_X is incorrectly placed under a different module
+    (r'polycall/core/polycall/core/polycall_([^"]+)', r'polycall/core/polycall/polycall_\1'),
+    
+    # Fix module placeholders directly under polycall
+    (r'polycall/auth/([^"]+)', r'polycall/core/auth/\1'),
+    (r'polycall/config/([^"]+)', r'polycall/core/config/\1'),
+    (r'polycall/network/([^"]+)', r'polycall/core/network/\1'),
+    (r'polycall/ffi/([^"]+)', r'polycall/core/ffi/\1'),
+    
+    # Fix recursive nesting by flattening to direct paths
+    (r'core/core/([^"]+)', r'core/\1'),
+    (r'polycall/polycall/([^"]+)', r'polycall/\1'),
+    
+    # Fix direct polycall_*.h references
+    (r'"polycall_([^"]+\.h)"', r'"polycall/core/polycall/polycall_\1"'),
+    
+    # Handle specific auth references  
+    (r'"polycall_auth_([^"]+\.h)"', r'"polycall/core/auth/polycall_auth_\1"'),
+    
+    # Specifically targeting the polycall_auth_context.h issue
+    (r'"../polycall/polycall_([^"]+)"', r'"polycall/core/polycall/polycall_\1"'),
+)
+
+def literal_prefix(pattern: str) -> str:
+    """
+    Return the literal text a regex pattern starts with, up to its first
+    metacharacter. Any string the pattern matches must contain it: a
+    character made optional by a following ?, * or {m,n} is dropped, and a
+    pattern with alternation gets no prefix at all.
+    """
+    if '|' in pattern:
+        return ''
+    
+    prefix = re.match(r'[^\\.^$*+?{}\[\]|()]*', pattern).group(0)
+    if pattern[len(prefix):len(prefix) + 1] in ('?', '*', '{'):
+        prefix = prefix[:-1]
+    return prefix
+
+# Compiled once; applied in order to each include path. Each rule carries
+# its literal prefix so a plain substring test can skip the regex.
+_COMPILED_RULES = tuple(
+    (literal_prefix(pattern), re.compile(pattern), replacement)
+    for pattern, replacement in NESTED_PATTERNS
+)
+
+# All patterns fused into one alternation: a single search tells whether
+# any rule applies. The rules feed into each other, so a path that does
+# match still goes through them in order.
+_ANY_RULE = re.compile('|'.join(f"(?:{pattern})" for pattern, _ in NESTED_PATTERNS))
+
+@functools.lru_cache(maxsize=8192)
+def rewrite_include_path(include_path: str) -> str:
+    """
+    Apply every nested path replacement, in order, to one include path.
+    The same few include paths recur across most files, so results are cached.
+    """
+    if not _ANY_RULE.search(include_path):
+        return include_path
+    
+    for hint, pattern, replacement in _COMPILED_RULES:
+        if hint in include_path:
+            include_path = pattern.sub(replacement, include_path)
+    return include_path
+
 class NestedPathFixer:
     """Fixes nested module path patterns in include statements."""
     
-    def __init__(self, project_root: str, dry_run: bool = False, verbose: bool = False):
+    def __init__(self, project_root: str, dry_run: bool = False, verbose: bool = False,
+                 jobs: Optional[int] = None):
         self.project_root = Path(project_root)
         self.include_dir = self.project_root / "include"
         self.src_dir = self.project_root / "src"
         self.dry_run = dry_run
+        self.jobs = jobs or os.cpu_count() or 1
         
         if verbose:
             logger.setLevel(logging.DEBUG)
@@ -43,137 +148,118 @@ class NestedPathFixer:
         self.includes_fixed = 0
         
         # Specific pattern replacements for nested paths
-        self.nested_patterns = [
-            # Fix nested core/polycall/core paths with module-specific replacements
-            (r'polycall/core/polycall/core/auth/([^"]+)', r'polycall/core/auth/\1'),
-            (r'polycall/core/polycall/core/config/([^"]+)', r'polycall/core/config/\1'),
-            (r'polycall/core/polycall/core/edge/([^"]+)', r'polycall/core/edge/\1'),
-            (r'polycall/core/polycall/core/ffi/([^"]+)', r'polycall/core/ffi/\1'),
-            (r'polycall/core/polycall/core/micro/([^"]+)', r'polycall/core/micro/\1'),
-            (r'polycall/core/polycall/core/network/([^"]+)', r'polycall/core/network/\1'),
-            (r'polycall/core/polycall/core/protocol/([^"]+)', r'polycall/core/protocol/\1'),
-            (r'polycall/core/polycall/core/telemetry/([^"]+)', r'polycall/core/telemetry/\1'),
-            
-            # Generic pattern for core/polycall/core module
-            (r'polycall/core/polycall/core/([^/]+)/([^"]+)', r'polycall/core/\1/\2'),
-            
-            # Fix cases where polycall_X is incorrectly placed under a different module
-            (r'polycall/core/polycall/core/polycall_([^"]+)', r'polycall/core/polycall/polycall_\1'),
-            
-            # Fix module placeholders directly under polycall
-            (r'polycall/auth/([^"]+)', r'polycall/core/auth/\1'),
-            (r'polycall/config/([^"]+)', r'polycall/core/config/\1'),
-            (r'polycall/network/([^"]+)', r'polycall/core/network/\1'),
-            (r'polycall/ffi/([^"]+)', r'polycall/core/ffi/\1'),
-            
-            # Fix recursive nesting by flattening to direct paths
-            (r'core/core/([^"]+)', r'core/\1'),
-            (r'polycall/polycall/([^"]+)', r'polycall/\1'),
-            
-            # Fix direct polycall_*.h references
-            (r'"polycall_([^"]+\.h)"', r'"polycall/core/polycall/polycall_\1"'),
-            
-            # Handle specific auth references  
-            (r'"polycall_auth_([^"]+\.h)"', r'"polycall/core/auth/polycall_auth_\1"'),
-            
-            # Specifically targeting the polycall_auth_context.h issue
-            (r'"../polycall/polycall_([^"]+)"', r'"polycall/core/polycall/polycall_\1"'),
-        ]
+        self.nested_patterns = NESTED_PATTERNS
+    
+    def fix_include_path(self, include_path: str) -> str:
+        """Apply every nested path replacement, in order, to one include path."""
+        return rewrite_include_path(include_path)
     
-    def find_all_files(self) -> list:
+    def find_all_files(self) -> List[str]:
         """Find all source and header files in the project."""
         all_files = []
         
-        # Find header files in include directory
+        # Header files in include directory, source files in src directory;
+        # each tree is walked once
         if self.include_dir.exists():
-            for header_file in self.include_dir.glob('**/*.h'):
-                all_files.append(header_file)
-        
-        # Find source files in src directory
+            all_files.extend(iter_files(str(self.include_dir), ('.h',)))
         if self.src_dir.exists():
-            for source_file in self.src_dir.glob('**/*.c'):
-                all_files.append(source_file)
-            for source_file in self.src_dir.glob('**/*.cpp'):
-                all_files.append(source_file)
+            all_files.extend(iter_files(str(self.src_dir), ('.c', '.cpp')))
         
         return sorted(all_files)
     
-    def fix_file(self, file_path: Path) -> bool:
+    def _record_result(self, includes_fixed: int):
+        """Fold one file's result into the statistics."""
+        self.files_processed += 1
+        self.includes_fixed += includes_fixed
+        if includes_fixed and not self.dry_run:
+            self.files_modified += 1
+    
+    def fix_file(self, file_path: str) -> bool:
         """
         Fix nested include paths in a single file.
         Returns True if the file was modified.
         """
-        logger.debug(f"Processing file: {file_path}")
-        self.files_processed += 1
+        includes_fixed = self._fix_file(file_path)
+        self._record_result(includes_fixed)
+        return includes_fixed > 0
+    
+    def _fix_file(self, file_path: str) -> int:
+        """
+        Fix nested include paths in a single file without touching the
+        statistics, so it can run in a worker process.
+        Returns the number of distinct include paths fixed.
+        """
+        logger.debug("Processing file: %s", file_path)
         
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
-                content = f.read()
+            with open(file_path, 'rb') as f:
+                raw = f.read()
             
-            original_content = content
-            modified_content = content
+            # Files without any include statement need no decoding or regex work
+            if b'#include' not in raw:
+                return 0
             
-            # Track modifications
-            changes_made = False
-            fixes = []
+            # Decode as text mode would, with universal newlines
+            content = raw.decode('utf-8', errors='replace')
+            if b'\r' in raw:
+                content = content.replace('\r\n', '\n').replace('\r', '\n')
             
-            # Find all include statements
-            include_pattern = re.compile(r'#\s*include\s+"([^"]+)"')
-            include_matches = include_pattern.findall(content)
+            # Rewrite every include statement in one pass, remembering each
+            # distinct include path that changed
+            fixed_paths = {}
             
-            for include_path in include_matches:
-                # Save original for comparison
-                original_include = include_path
-                fixed_include = include_path
-                
-                # Apply each pattern replacement in sequence
-                for pattern, replacement in self.nested_patterns:
-                    if re.search(pattern, fixed_include):
-                        fixed_include = re.sub(pattern, replacement, fixed_include)
-                        
-                # Only proceed if the path actually changed
-                if fixed_include != original_include:
-                    # Create pattern to match the full include statement
-                    pattern_in_file = f'#include\\s+"{re.escape(original_include)}"'
-                    replacement_in_file = f'#include "{fixed_include}"'
-                    
-                    # Apply the replacement
-                    new_content = re.sub(pattern_in_file, replacement_in_file, modified_content)
-                    if new_content != modified_content:
-                        modified_content = new_content
-                        changes_made = True
-                        self.includes_fixed += 1
-                        fixes.append(f"{original_include} → {fixed_include}")
+            def rewrite(match):
+                original_include = match.group(1)
+                fixed_include = self.fix_include_path(original_include)
+                if fixed_include == original_include:
+                    return match.group(0)
+                fixed_paths.setdefault(original_include, fixed_include)
+                return f'#include "{fixed_include}"'
+            
+            modified_content = INCLUDE_PATTERN.sub(rewrite, content)
             
             # Write changes if modified
-            if changes_made and modified_content != original_content:
+            if fixed_paths:
                 if not self.dry_run:
                     with open(file_path, 'w', encoding='utf-8') as f:
                         f.write(modified_content)
-                    self.files_modified += 1
-                    logger.info(f"Fixed {len(fixes)} nested path patterns in {file_path}")
+                    logger.info("Fixed %d nested path patterns in %s", len(fixed_paths), file_path)
                 else:
-                    logger.info(f"[DRY RUN] Would fix {len(fixes)} nested path patterns in {file_path}")
+                    logger.info("[DRY RUN] Would fix %d nested path patterns in %s", len(fixed_paths), file_path)
                 
                 # Log the specific fixes
-                for fix in fixes:
-                    logger.debug(f"  Fixed: {fix}")
-                
-                return True
+                if logger.isEnabledFor(logging.DEBUG):
+                    for original_include, fixed_include in fixed_paths.items():
+                        logger.debug("  Fixed: %s → %s", original_include, fixed_include)
             
-            return False
+            return len(fixed_paths)
             
         except Exception as e:
             logger.error(f"Error processing {file_path}: {e}")
-            return False
+            return 0
     
     def run(self) -> bool:
         """Run the nested path fixer on all files."""
         files = self.find_all_files()
         logger.info(f"Found {len(files)} files to process")
         
-        for file_path in files:
-            self.fix_file(file_path)
+        if self.jobs > 1 and len(files) > 1:
+            # Files are independent; fix them in worker processes and fold
+            # the per-file counts into the statistics here
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.jobs,
+                initializer=_init_worker,
+                initargs=(self, logger.level)
+            ) as executor:
+                for includes_fixed in executor.map(
+                    _fix_one,
+                    files,
+                    chunksize=max(1, min(64, len(files) // (self.jobs * 4)))
+                ):
+                    self._record_result(includes_fixed)
+        else:
+            for file_path in files:
+                self.fix_file(file_path)
         
         # Print summary
         logger.info("\n=== Nested Path Fixer Summary ===")
@@ -186,18 +272,31 @@ class NestedPathFixer:
         
         return self.includes_fixed > 0
 
+# Fixer installed in each worker process by _init_worker
+_worker_fixer = None
+
+def _init_worker(fixer: NestedPathFixer, log_level: int) -> None:
+    global _worker_fixer
+    _worker_fixer = fixer
+    logger.setLevel(log_level)
+
+def _fix_one(file_path: str) -> int:
+    return _worker_fixer._fix_file(file_path)
+
 def main():
     parser = argparse.ArgumentParser(description="LibPolyCall Nested Path Include Corrector")
     parser.add_argument("--project-root", required=True, help="Project root directory")
     parser.add_argument("--dry-run", action="store_true", help="Show what would be changed without modifying files")
     parser.add_argument("--verbose", action="store_true", help="Enable verbose logging")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="Number of worker processes")
     
     args = parser.parse_args()
     
     fixer = NestedPathFixer(
         project_root=args.project_root,
         dry_run=args.dry_run,
-        verbose=args.verbose
+        verbose=args.verbose,
+        jobs=args.jobs
     )
     
     success = fixer.run()
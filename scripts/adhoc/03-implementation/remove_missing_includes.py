@@ -17,6 +17,7 @@ The script will:
 """
 
 import os
+from functools import lru_cache
 from pathlib import Path
 import re
 
@@ -27,8 +28,36 @@ INCLUDE_DIR = PROJECT_ROOT / "include"
 INCLUDE_PATTERN = re.compile(r'#\s*include\s+"([^"]+)"')
 
 
+@lru_cache(maxsize=None)
+def build_header_index() -> frozenset:
+    """
+    Collect every file path under src/ and include/, relative to its base, in
+    one walk. Symlinked directories are followed, as Path.exists() would.
+    """
+    index = set()
+    for base in [SRC_DIR, INCLUDE_DIR]:
+        visited = set()
+        for root, dirs, files in os.walk(base, followlinks=True):
+            # Do not loop through symlinks back into a directory already walked
+            st = os.stat(root)
+            if (st.st_dev, st.st_ino) in visited:
+                dirs[:] = []
+                continue
+            visited.add((st.st_dev, st.st_ino))
+            rel_root = os.path.relpath(root, base)
+            for name in files:
+                index.add(os.path.normpath(os.path.join(rel_root, name)))
+    return frozenset(index)
+
+
 def header_exists(include_path: str) -> bool:
-    """Check if the include path exists in the src or include directory."""
+    """
+    Check if the include path exists in the src or include directory. The
+    index only answers hits; a miss is confirmed on the filesystem, which
+    applies its own case and symlink rules, before a line is removed.
+    """
+    if os.path.normpath(include_path) in build_header_index():
+        return True
     return any(
         (base / include_path).exists()
         for base in [SRC_DIR, INCLUDE_DIR]
@@ -13,7 +13,7 @@ import os
 import sys
 import subprocess
 import argparse
-import tempfile
+import functools
 import shutil
 from datetime import datetime
 
@@ -33,9 +33,50 @@ def run_command(cmd, cwd=None, capture_output=True):
         print(f"Error details: {e.stderr}")
         sys.exit(1)
 
-def get_branch_commit(branch):
-    """Get the commit hash of a branch"""
-    return run_command(['git', 'rev-parse', branch]).strip()
+def run_git_with_paths(args, paths, cwd):
+    """
+    Run a git command over many paths in one invocation, passing them
+    NUL-separated on stdin so neither ARG_MAX nor pathspec globbing applies
+    """
+    cmd = ['git', '--literal-pathspecs', *args, '--pathspec-from-file=-', '--pathspec-file-nul']
+    result = subprocess.run(
+        cmd,
+        cwd=cwd,
+        input="\0".join(paths),
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        print(f"Error executing command: {' '.join(cmd)}")
+        print(f"Error details: {result.stderr}")
+    return result.returncode == 0
+
+@functools.lru_cache(maxsize=None)
+def resolve_ref(repo_path, ref):
+    """Resolve ref to the hash of the commit it names, or None; cached per process"""
+    result = subprocess.run(
+        ['git', 'rev-parse', '--verify', '--quiet', f'{ref}^{{commit}}'],
+        cwd=repo_path,
+        capture_output=True,
+        text=True
+    )
+    return result.stdout.strip() if result.returncode == 0 else None
+
+def snapshot_tree(source_dir, target_dir):
+    """
+    Copy a directory tree for a backup. GNU cp with --reflink=auto shares
+    data blocks copy-on-write where the filesystem supports it and copies
+    normally elsewhere; without it, fall back to shutil.copytree.
+    """
+    if sys.platform.startswith("linux") and shutil.which("cp"):
+        os.makedirs(target_dir, exist_ok=True)
+        result = subprocess.run(
+            ["cp", "-a", "--reflink=auto", os.path.join(source_dir, "."), target_dir],
+            stderr=subprocess.PIPE
+        )
+        if result.returncode == 0:
+            return
+    shutil.copytree(source_dir, target_dir, dirs_exist_ok=True)
 
 def create_backup(repo_path, branch_name):
     """Create a backup of the current state"""
@@ -47,8 +88,7 @@ def create_backup(repo_path, branch_name):
         source_dir = os.path.join(repo_path, directory)
         if os.path.exists(source_dir):
             target_dir = os.path.join(backup_dir, directory)
-            os.makedirs(os.path.dirname(target_dir), exist_ok=True)
-            shutil.copytree(source_dir, target_dir)
+            snapshot_tree(source_dir, target_dir)
             print(f"Backed up {directory} to {backup_dir}")
     
     return backup_dir
@@ -57,19 +97,16 @@ def analyze_differences(repo_path, source_branch, target_branch, focus_path):
     """Analyze key differences between branches for a specific path"""
     print(f"\nAnalyzing differences in {focus_path} between {source_branch} and {target_branch}...")
     
-    # Get files that differ in the focus path
+    # Get files that differ in the focus path as NUL-separated status/path
+    # pairs; renames are reported as a delete plus an add so every record
+    # carries exactly one path
     diff_output = run_command([
-        'git', 'diff', '--name-status', f'{target_branch}..{source_branch}', '--', focus_path
+        'git', 'diff', '--name-status', '-z', '--no-renames',
+        f'{target_branch}..{source_branch}', '--', focus_path
     ], cwd=repo_path)
     
-    changed_files = []
-    for line in diff_output.splitlines():
-        if not line.strip():
-            continue
-        status, file_path = line.split(maxsplit=1)
-        changed_files.append((status, file_path))
-    
-    return changed_files
+    fields = diff_output.split('\0')
+    return list(zip(fields[0::2], fields[1::2]))
 
 def create_resolution_branch(repo_path, source_branch, target_branch, focus_paths):
     """Create a resolution branch from target branch with changes from source branch"""
@@ -106,42 +143,36 @@ def create_resolution_branch(repo_path, source_branch, target_branch, focus_path
         run_command(['git', 'branch', '-D', resolution_branch], cwd=repo_path, capture_output=False)
         return None
     
-    # Create a temporary directory to extract files from source branch
-    with tempfile.TemporaryDirectory() as temp_dir:
-        source_commit = get_branch_commit(source_branch)
-        
-        # Extract and apply changes from each changed file
-        for status, file_path in all_changed_files:
-            if status[0] == 'D':
-                # Handle deleted files
-                print(f"Removing {file_path}...")
-                if os.path.exists(os.path.join(repo_path, file_path)):
-                    run_command(['git', 'rm', file_path], cwd=repo_path, capture_output=False)
-            else:
-                # Extract file from source branch
-                try:
-                    file_content = run_command(['git', 'show', f'{source_commit}:{file_path}'], cwd=repo_path)
-                    
-                    # Ensure directory exists
-                    os.makedirs(os.path.dirname(os.path.join(repo_path, file_path)), exist_ok=True)
-                    
-                    # Write file content
-                    with open(os.path.join(repo_path, file_path), 'w') as f:
-                        f.write(file_content)
-                    
-                    # Stage file
-                    run_command(['git', 'add', file_path], cwd=repo_path, capture_output=False)
-                    print(f"Applied changes to {file_path}")
-                except Exception as e:
-                    print(f"Error applying changes to {file_path}: {str(e)}")
-        
-        # Commit the changes
-        commit_message = f"fix: Resolve issues in {', '.join(focus_paths)} by merging from {source_branch}\n\n"
-        commit_message += "This commit resolves codebase issues by applying targeted fixes from the working branch.\n"
-        commit_message += f"Source: {source_branch} ({source_commit})\n"
-        
-        run_command(['git', 'commit', '-m', commit_message], cwd=repo_path, capture_output=False)
-        print(f"\nCommitted changes to {resolution_branch}")
+    source_commit = resolve_ref(repo_path, source_branch)
+    
+    # Handle deleted files with a single git rm
+    deleted_paths = []
+    for status, file_path in all_changed_files:
+        if status[0] == 'D':
+            print(f"Removing {file_path}...")
+            if os.path.exists(os.path.join(repo_path, file_path)):
+                deleted_paths.append(file_path)
+    if deleted_paths and not run_git_with_paths(['rm', '--quiet'], deleted_paths, repo_path):
+        sys.exit(1)
+    
+    # Check out the remaining changed files from the source commit; this
+    # writes and stages them all in one go
+    changed_paths = [file_path for status, file_path in all_changed_files if status[0] != 'D']
+    if changed_paths:
+        if run_git_with_paths(['checkout', source_commit], changed_paths, repo_path):
+            for file_path in changed_paths:
+                print(f"Applied changes to {file_path}")
+        else:
+            print(f"Error applying changes from {source_branch}")
+            sys.exit(1)
+    
+    # Commit the changes
+    commit_message = f"fix: Resolve issues in {', '.join(focus_paths)} by merging from {source_branch}\n\n"
+    commit_message += "This commit resolves codebase issues by applying targeted fixes from the working branch.\n"
+    commit_message += f"Source: {source_branch} ({source_commit})\n"
+    
+    run_command(['git', 'commit', '-m', commit_message], cwd=repo_path, capture_output=False)
+    print(f"\nCommitted changes to {resolution_branch}")
     
     return resolution_branch
 
@@ -180,9 +211,7 @@ def main():
     
     # Validate branches
     for branch in [args.source, args.target]:
-        try:
-            run_command(['git', 'rev-parse', '--verify', branch], cwd=repo_path)
-        except:
+        if resolve_ref(repo_path, branch) is None:
             print(f"Error: Branch '{branch}' does not exist")
             sys.exit(1)
     
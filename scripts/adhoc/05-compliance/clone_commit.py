@@ -1,6 +1,11 @@
 import os
 import subprocess
 import argparse
+import functools
+import concurrent.futures
+
+# Worktrees created concurrently; each is mostly checkout I/O
+WORKTREE_WORKERS = min(8, os.cpu_count() or 1)
 
 
 def get_commit_range(repo_path, start_commit=None, count=10):
@@ -24,42 +29,47 @@ def get_commit_range(repo_path, start_commit=None, count=10):
     
     return result.stdout.splitlines()
 
-def clone_specific_commits(repo_path, output_dir, start_commit=None, count=10):
+def make_worktree(repo_path, output_dir, commit):
+    """Create a detached worktree for one 'hash message' log line and return what to report."""
+    try:
+        commit_hash, commit_message = commit.split(" ", 1)
+    except ValueError:
+        return f"Warning: Could not parse commit '{commit}', skipping"
+        
+    # Sanitize the commit message for directory naming
+    safe_message = "".join(c if c.isalnum() or c in ['-', '_'] else '_' for c in commit_message[:40])
+    commit_dir = os.path.join(output_dir, f"librift-{commit_hash}-{safe_message}")
+    
+    # Claim the directory atomically so concurrent tasks cannot share it
+    try:
+        os.makedirs(commit_dir)
+    except FileExistsError:
+        return f"Directory already exists for {commit_hash}, skipping"
+    
+    # Create a worktree for this commit
+    try:
+        subprocess.run(
+            ["git", "worktree", "add", "--detach", commit_dir, commit_hash],
+            cwd=repo_path,
+            check=True,
+            capture_output=True,
+            text=True
+        )
+    except subprocess.CalledProcessError as e:
+        return f"Error creating worktree for {commit_hash}: {e.stderr}"
+    
+    return f"Created worktree for {commit_hash} - {commit_message} at {commit_dir}"
+
+def clone_specific_commits(repo_path, output_dir, start_commit=None, count=10, jobs=WORKTREE_WORKERS):
     """Clone a range of commits into separate directories for analysis."""
     # Get the specified range of commits
     commits = get_commit_range(repo_path, start_commit, count)
     
-    for commit in commits:
-        try:
-            commit_hash, commit_message = commit.split(" ", 1)
-        except ValueError:
-            print(f"Warning: Could not parse commit '{commit}', skipping")
-            continue
-            
-        # Sanitize the commit message for directory naming
-        safe_message = "".join(c if c.isalnum() or c in ['-', '_'] else '_' for c in commit_message[:40])
-        commit_dir = os.path.join(output_dir, f"librift-{commit_hash}-{safe_message}")
-        
-        if os.path.exists(commit_dir):
-            print(f"Directory already exists for {commit_hash}, skipping")
-            continue
-            
-        os.makedirs(commit_dir, exist_ok=True)
-        
-        # Create a worktree for this commit
-        try:
-            subprocess.run(
-                ["git", "worktree", "add", "--detach", commit_dir, commit_hash],
-                cwd=repo_path,
-                check=True,
-                capture_output=True,
-                text=True
-            )
-        except subprocess.CalledProcessError as e:
-            print(f"Error creating worktree for {commit_hash}: {e.stderr}")
-            continue
-        
-        print(f"Created worktree for {commit_hash} - {commit_message} at {commit_dir}")
+    # Worktrees go into distinct directories, so they are created in parallel;
+    # results are reported in commit order
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        for message in executor.map(functools.partial(make_worktree, repo_path, output_dir), commits):
+            print(message)
     
     return len(commits)
 
@@ -100,6 +110,7 @@ def main():
     parser.add_argument("--start", help="Starting commit hash (default: HEAD)", default="HEAD")
     parser.add_argument("--count", help="Number of commits to analyze", type=int, default=10)
     parser.add_argument("--verify", help="Verify the automaton module integrity", action="store_true")
+    parser.add_argument("--jobs", help="Number of worktrees to create at once", type=int, default=WORKTREE_WORKERS)
     
     args = parser.parse_args()
     
@@ -107,7 +118,7 @@ def main():
     os.makedirs(args.output_dir, exist_ok=True)
     
     # Clone the specified commits
-    num_cloned = clone_specific_commits(args.repo_path, args.output_dir, args.start, args.count)
+    num_cloned = clone_specific_commits(args.repo_path, args.output_dir, args.start, args.count, args.jobs)
     print(f"Successfully cloned {num_cloned} commits")
     
     # Optionally verify the automaton module
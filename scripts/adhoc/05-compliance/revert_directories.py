@@ -4,69 +4,104 @@ import subprocess
 import shutil
 import argparse
 import sys
+import tempfile
+import functools
+
+@functools.lru_cache(maxsize=None)
+def resolve_ref(repo_path, ref):
+    """Resolve ref to the hash of the commit it names, or None; cached per process"""
+    result = subprocess.run(
+        ["git", "rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}"],
+        cwd=repo_path,
+        capture_output=True,
+        text=True
+    )
+    return result.stdout.strip() if result.returncode == 0 else None
+
+def snapshot_tree(source_dir, target_dir):
+    """
+    Copy a directory tree for a backup. GNU cp with --reflink=auto shares
+    data blocks copy-on-write where the filesystem supports it and copies
+    normally elsewhere; without it, fall back to shutil.copytree.
+    """
+    if sys.platform.startswith("linux") and shutil.which("cp"):
+        os.makedirs(target_dir, exist_ok=True)
+        result = subprocess.run(
+            ["cp", "-a", "--reflink=auto", os.path.join(source_dir, "."), target_dir],
+            stderr=subprocess.PIPE
+        )
+        if result.returncode == 0:
+            return
+    shutil.copytree(source_dir, target_dir, dirs_exist_ok=True)
 
 def restore_directories_from_commit(repo_path, commit_hash, directories):
     """Restore specified directories from a target commit"""
-    temp_dir = os.path.join(repo_path, "_temp_restore")
-    os.makedirs(temp_dir, exist_ok=True)
-    
     success = True
     restored_files = 0
     
+    # Get all files from the specified directories in the target commit
     try:
-        # Get all files from the specified directories in the target commit
-        for directory in directories:
-            try:
-                result = subprocess.run(
-                    ["git", "ls-tree", "-r", "--name-only", commit_hash, directory],
-                    cwd=repo_path,
-                    stdout=subprocess.PIPE,
-                    text=True,
-                    check=True
-                )
-                files = result.stdout.splitlines()
-                
-                if not files:
-                    print(f"No files found in '{directory}' at commit {commit_hash}")
-                    continue
-                
-                print(f"Found {len(files)} files in '{directory}'")
-                
-                for file_path in files:
-                    # Extract file from target commit
-                    try:
-                        content_result = subprocess.run(
-                            ["git", "show", f"{commit_hash}:{file_path}"],
-                            cwd=repo_path,
-                            stdout=subprocess.PIPE,
-                            check=True
-                        )
-                        
-                        # Prepare target directory
-                        dest_file = os.path.join(repo_path, file_path)
-                        dest_dir = os.path.dirname(dest_file)
-                        os.makedirs(dest_dir, exist_ok=True)
-                        
-                        # Write file
-                        with open(dest_file, 'wb') as f:
-                            f.write(content_result.stdout)
-                        
-                        restored_files += 1
-                        print(f"Restored: {file_path}")
-                        
-                    except subprocess.CalledProcessError as e:
-                        print(f"Failed to extract {file_path}: {e}")
-                        success = False
-                
-            except subprocess.CalledProcessError as e:
-                print(f"Error listing files in '{directory}': {e}")
-                success = False
-        
+        result = subprocess.run(
+            ["git", "ls-tree", "-r", "-z", commit_hash, "--", *directories],
+            cwd=repo_path,
+            stdout=subprocess.PIPE,
+            check=True
+        )
+    except subprocess.CalledProcessError as e:
+        print(f"Error listing files in {', '.join(directories)}: {e}")
+        return False, restored_files
+    
+    # Entries are "<mode> <type> <object>\t<path>", which is also the
+    # format 'git update-index --index-info' reads
+    entries = []
+    files = []
+    for entry in result.stdout.split(b"\0"):
+        info, _, path = entry.partition(b"\t")
+        if info.split(b" ")[1:2] == [b"blob"]:
+            entries.append(entry)
+            files.append(os.fsdecode(path))
+    
+    for directory in directories:
+        prefix = directory.rstrip("/") + "/"
+        count = sum(1 for file_path in files if file_path.startswith(prefix))
+        if count:
+            print(f"Found {count} files in '{directory}'")
+        else:
+            print(f"No files found in '{directory}' at commit {commit_hash}")
+    
+    if not files:
         return success, restored_files
     
-    finally:
-        # Clean up temp directory
-        shutil.rmtree(temp_dir, ignore_errors=True)
+    # Stage the entries in a throwaway index and let git write them all into
+    # the working tree, leaving the repository's own index untouched
+    with tempfile.TemporaryDirectory() as temp_dir:
+        env = dict(os.environ, GIT_INDEX_FILE=os.path.join(temp_dir, "index"))
+        try:
+            subprocess.run(
+                ["git", "update-index", "-z", "--index-info"],
+                cwd=repo_path,
+                input=b"\0".join(entries) + b"\0",
+                env=env,
+                check=True
+            )
+            subprocess.run(
+                ["git", "checkout-index", "--all", "--force"],
+                cwd=repo_path,
+                env=env,
+                check=True
+            )
+        except subprocess.CalledProcessError as e:
+            print(f"Error restoring files from {commit_hash}: {e}")
+            success = False
+    
+    for file_path in files:
+        if success or os.path.lexists(os.path.join(repo_path, file_path)):
+            print(f"Restored: {file_path}")
+            restored_files += 1
+        else:
+            print(f"Failed to restore {file_path}")
+    
+    return success, restored_files
 
 def fix_includes(repo_path):
     """Run the fix_includes.sh script to correct include paths"""
@@ -77,12 +112,9 @@ def fix_includes(repo_path):
         return False
     
     try:
-        # Ensure the script is executable
-        os.chmod(fix_script, 0o755)
-        
-        # Run the script
+        # Run the script through bash so it needs no execute bit
         print("\nRunning include path fixes...")
-        subprocess.run([fix_script], cwd=repo_path, check=True)
+        subprocess.run(["bash", fix_script], cwd=repo_path, check=True)
         return True
     
     except subprocess.CalledProcessError as e:
@@ -98,12 +130,9 @@ def sync_headers(repo_path):
         return False
     
     try:
-        # Ensure the script is executable
-        os.chmod(sync_script, 0o755)
-        
-        # Run the script
+        # Run the script through bash so it needs no execute bit
         print("\nSynchronizing headers...")
-        subprocess.run([sync_script], cwd=repo_path, check=True)
+        subprocess.run(["bash", sync_script], cwd=repo_path, check=True)
         return True
     
     except subprocess.CalledProcessError as e:
@@ -142,19 +171,7 @@ def main():
         sys.exit(1)
     
     # Validate commit hash
-    try:
-        result = subprocess.run(
-            ["git", "cat-file", "-t", args.commit_hash],
-            cwd=args.repo_path,
-            stdout=subprocess.PIPE,
-            text=True,
-            check=True
-        )
-        obj_type = result.stdout.strip()
-        if obj_type != "commit":
-            print(f"Error: {args.commit_hash} is not a valid commit hash")
-            sys.exit(1)
-    except subprocess.CalledProcessError:
+    if resolve_ref(args.repo_path, args.commit_hash) is None:
         print(f"Error: {args.commit_hash} is not a valid commit hash")
         sys.exit(1)
     
@@ -172,7 +189,7 @@ def main():
         source_dir = os.path.join(args.repo_path, directory)
         if os.path.exists(source_dir):
             target_dir = os.path.join(backup_dir, directory)
-            shutil.copytree(source_dir, target_dir, dirs_exist_ok=True)
+            snapshot_tree(source_dir, target_dir)
             print(f"Backed up {directory}")
     
     # Restore directories from target commit
@@ -1,7 +1,72 @@
 import os
 import subprocess
 import argparse
-import shutil
+import threading
+
+def read_blobs(repo_path, commit, paths):
+    """
+    Yield (path, content) for each path at commit, read through a single
+    'git cat-file --batch' process; content is None if the path is missing
+    """
+    process = subprocess.Popen(
+        ["git", "cat-file", "--batch"],
+        cwd=repo_path,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE
+    )
+    
+    # Feed requests from a thread so a full stdout pipe cannot block them
+    def send_requests():
+        try:
+            for path in paths:
+                process.stdin.write(f"{commit}:{path}\n".encode())
+            process.stdin.close()
+        except (BrokenPipeError, ValueError):
+            pass  # The reader stopped early and cat-file was killed
+    
+    writer = threading.Thread(target=send_requests, daemon=True)
+    writer.start()
+    
+    try:
+        for path in paths:
+            header = process.stdout.readline()
+            if not header or header.rstrip(b"\n").endswith((b" missing", b" ambiguous")):
+                yield path, None
+                continue
+            
+            size = int(header.split()[2])
+            content = process.stdout.read(size)
+            process.stdout.read(1)  # trailing newline
+            yield path, content
+    finally:
+        # If the consumer stopped early, cat-file may be blocked on a full
+        # stdout pipe and the writer on a full stdin pipe; stop cat-file
+        # before waiting for the writer so neither can hang
+        if process.poll() is None:
+            process.kill()
+        process.stdout.close()
+        writer.join()
+        process.wait()
+
+def write_blob(dest_file, content):
+    """
+    Write a restored blob straight from memory: reserve its blocks up front,
+    then hand the whole buffer to os.write instead of going through a
+    buffered file object
+    """
+    fd = os.open(dest_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        if content and hasattr(os, "posix_fallocate"):
+            try:
+                os.posix_fallocate(fd, 0, len(content))
+            except OSError:
+                pass  # Not supported by this filesystem
+        
+        view = memoryview(content)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
 
 def revert_module_to_commit(repo_path, module_path, target_commit):
     """Revert a specific module to a known good commit."""
@@ -12,13 +77,13 @@ def revert_module_to_commit(repo_path, module_path, target_commit):
     # First, get the files in the module
     try:
         result = subprocess.run(
-            ["git", "ls-tree", "-r", "--name-only", target_commit, module_path],
+            ["git", "ls-tree", "-r", "--name-only", "-z", target_commit, "--", module_path],
             cwd=repo_path,
             stdout=subprocess.PIPE,
             text=True,
             check=True
         )
-        module_files = result.stdout.splitlines()
+        module_files = [file_path for file_path in result.stdout.split("\0") if file_path]
     except subprocess.CalledProcessError as e:
         print(f"Error listing files: {e}")
         return False
@@ -27,54 +92,23 @@ def revert_module_to_commit(repo_path, module_path, target_commit):
         print(f"No files found in module '{module_path}' at commit {target_commit}")
         return False
     
-    # Create a temporary directory to restore files
-    temp_dir = os.path.join(repo_path, "_temp_restore")
-    os.makedirs(temp_dir, exist_ok=True)
+    # Create each destination directory once up front, parents first
+    dest_dirs = {os.path.dirname(os.path.join(repo_path, file_path)) for file_path in module_files}
+    for dest_dir in sorted(dest_dirs, key=len):
+        os.makedirs(dest_dir, exist_ok=True)
     
-    try:
-        # Checkout the module files from the target commit
-        for file_path in module_files:
-            # Extract the file name and create any needed subdirectories
-            file_name = os.path.basename(file_path)
-            file_dir = os.path.dirname(file_path)
-            temp_file_dir = os.path.join(temp_dir, file_dir)
-            os.makedirs(temp_file_dir, exist_ok=True)
-            
-            # Get the file content from the target commit
-            try:
-                result = subprocess.run(
-                    ["git", "show", f"{target_commit}:{file_path}"],
-                    cwd=repo_path,
-                    stdout=subprocess.PIPE,
-                    check=True
-                )
-                
-                # Write the content to a temp file
-                with open(os.path.join(temp_file_dir, file_name), 'wb') as f:
-                    f.write(result.stdout)
-                
-                print(f"Retrieved {file_path} from commit {target_commit}")
-            except subprocess.CalledProcessError as e:
-                print(f"Error retrieving {file_path}: {e}")
-                continue
+    # Restore the module files from the target commit into the working directory
+    for file_path, content in read_blobs(repo_path, target_commit, module_files):
+        if content is None:
+            print(f"Error retrieving {file_path}: not found at {target_commit}")
+            continue
         
-        # Copy the restored files back to the working directory
-        for file_path in module_files:
-            temp_file = os.path.join(temp_dir, file_path)
-            dest_file = os.path.join(repo_path, file_path)
-            
-            # Ensure destination directory exists
-            os.makedirs(os.path.dirname(dest_file), exist_ok=True)
-            
-            if os.path.exists(temp_file):
-                shutil.copy2(temp_file, dest_file)
-                print(f"Restored {file_path}")
+        dest_file = os.path.join(repo_path, file_path)
+        write_blob(dest_file, content)
         
-        return True
+        print(f"Restored {file_path}")
     
-    finally:
-        # Clean up temporary directory
-        shutil.rmtree(temp_dir, ignore_errors=True)
+    return True
 
 def main():
     parser = argparse.ArgumentParser(description="Revert specific modules to a known good commit.")
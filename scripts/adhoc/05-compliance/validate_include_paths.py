@@ -12,11 +12,19 @@ Author: Based on Nnamdi Okpala's design (OBINexusComputing)
 import os
 import re
 import sys
+import mmap
+import json
+import hashlib
 import argparse
+import subprocess
 import logging
+import functools
+import itertools
+from array import array
+import concurrent.futures
 from pathlib import Path
-from typing import List, Dict, Set, Tuple, Optional
-from collections import defaultdict
+from typing import Callable, FrozenSet, Iterator, List, NamedTuple, Dict, Set, Tuple, Optional
+from collections import deque
 
 # Configure logging
 logging.basicConfig(
@@ -25,13 +33,251 @@ logging.basicConfig(
 )
 logger = logging.getLogger('libpolycall-include-validator')
 
+# Matches quoted include directives and captures the include path
+INCLUDE_PATTERN = re.compile(r'#\s*include\s+"([^"]+)"')
+INCLUDE_PATTERN_BYTES = re.compile(INCLUDE_PATTERN.pattern.encode('ascii'))
+
+# Files read ahead of the scanner, and threads issuing those reads
+READ_AHEAD = 32
+READ_THREADS = 8
+
+# Per-project cache of validation results, kept under the project root
+CACHE_DIR_NAME = '.polycall-cache'
+CACHE_FILE_NAME = 'include_validation.json'
+# Bumped whenever the shape of a cached scan result changes
+CACHE_FORMAT = 4
+
+# (number of includes, (include path, issue type) pairs, compliant include paths) for one header
+ScanResult = Tuple[int, List[Tuple[str, str]], List[str]]
+
+# (mtime_ns, size, SHA-256 hex digest) of the bytes a ScanResult was computed from
+Fingerprint = Tuple[int, int, str]
+
+def file_content_digest(file_path: str) -> str:
+    """Return the SHA-256 hex digest of a file's contents."""
+    with open(file_path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def git_changed_files(repo_dir: str, base: str, pathspecs: List[str]) -> List[str]:
+    """
+    Return the files matching pathspecs that changed between the merge base of
+    base and HEAD, relative to repo_dir. Deleted files are left out.
+    """
+    output = subprocess.check_output(
+        ["git", "-C", repo_dir, "diff", "--name-only", "--relative", "--diff-filter=d",
+         f"{base}...HEAD", "--", *pathspecs],
+        text=True
+    )
+    return output.splitlines()
+
+def iter_header_files(root: str) -> Iterator[str]:
+    """
+    Yield the paths of all .h files under root. Uses os.scandir so file
+    types come from the directory listing rather than a stat per entry.
+    """
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.endswith('.h') and entry.is_file():
+                        yield entry.path
+        except OSError as e:
+            logger.warning(f"Cannot scan {directory}: {e}")
+
+# Valid patterns simple enough to check with string operations instead of regex
+PREFIX_PATTERN = re.compile(r'\^((?:[\w-]+/)+)\.\*\\\.h\$')
+NAME_PATTERN = re.compile(r'\^((?:[\w-]+/)*[\w-]+)\\\.h\$')
+SYSTEM_PATTERN = r'^<.*>$'
+
+class IncludeClassifier(NamedTuple):
+    """The fused include pattern plus literal fast paths derived from the valid patterns."""
+    pattern: "re.Pattern"
+    valid_prefixes: Tuple[str, ...]
+    valid_names: FrozenSet[str]
+    system_valid: bool
+
+def derive_fast_paths(valid_patterns: List[str]) -> Tuple[Tuple[str, ...], FrozenSet[str], bool]:
+    """
+    Split out the valid patterns that are a literal prefix followed by '.*\\.h',
+    a literal header name, or the system include pattern. Any other pattern is
+    left to the regex.
+    """
+    prefixes = []
+    names = set()
+    system_valid = False
+    for pattern in valid_patterns:
+        prefix = PREFIX_PATTERN.fullmatch(pattern)
+        name = NAME_PATTERN.fullmatch(pattern)
+        if prefix:
+            prefixes.append(prefix.group(1))
+        elif name:
+            names.add(name.group(1) + ".h")
+        elif pattern == SYSTEM_PATTERN:
+            system_valid = True
+    return tuple(prefixes), frozenset(names), system_valid
+
+@functools.lru_cache(maxsize=None)
+def specialize_fast_path(valid_prefixes: Tuple[str, ...], valid_names: FrozenSet[str],
+                         system_valid: bool) -> Callable[[str], bool]:
+    """
+    Generate a straight-line predicate for the literal fast paths, with each
+    prefix and name inlined as a constant. Built once per rule set and process,
+    as IncludeClassifier itself must stay picklable for the worker processes.
+    """
+    lines = ["def is_fast_valid(s):",
+             "    if '\\n' in s:",
+             "        return False"]
+    if system_valid:
+        lines += ["    if s[:1] == '<' and s[-1:] == '>':",
+                  "        return True"]
+    lines.append("    if s[-2:] == '.h':")
+    for prefix in valid_prefixes:
+        lines += [f"        if s[:{len(prefix)}] == {prefix!r}:",
+                  "            return True"]
+    for name in sorted(valid_names):
+        lines += [f"        if s == {name!r}:",
+                  "            return True"]
+    lines.append("    return False")
+    
+    namespace = {}
+    exec(compile("\n".join(lines), "<include fast path>", "exec"), namespace)
+    return namespace["is_fast_valid"]
+
+@functools.lru_cache(maxsize=8192)
+def classify_include_path(classifier: IncludeClassifier, include_path: str) -> Optional[str]:
+    """
+    Classify an include path with the fused pattern from IncludePathValidator.
+    Returns None for a compliant path, otherwise its issue type. Memoized, as
+    the same few hundred include strings recur across every header.
+    """
+    # Literal fast paths can only confirm a valid match; '.' in the patterns
+    # does not match a newline, so such paths always go to the regex
+    if specialize_fast_path(classifier.valid_prefixes, classifier.valid_names,
+                            classifier.system_valid)(include_path):
+        return None
+    
+    match = classifier.pattern.match(include_path)
+    if not match:
+        return "unknown"
+    if match.lastgroup.startswith("valid_"):
+        return None
+    return match.lastgroup
+
+def extract_includes(file_path: str) -> List[str]:
+    """
+    Return the quoted include paths in a file. The file is memory-mapped and
+    scanned as bytes, so only the matched paths are ever decoded.
+    """
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return [match.group(1).decode('utf-8', 'replace')
+                    for match in INCLUDE_PATTERN_BYTES.finditer(mm)]
+
+def read_file_bytes(file_path: str) -> Tuple[bytes, Tuple[int, int]]:
+    """Return a file's bytes and its (mtime_ns, size) as of opening it."""
+    with open(file_path, 'rb') as f:
+        st = os.fstat(f.fileno())
+        return f.read(), (st.st_mtime_ns, st.st_size)
+
+def iter_prefetched(file_paths: List[str]) -> Iterator[Tuple[str, "concurrent.futures.Future"]]:
+    """
+    Yield (path, future of read_file_bytes(path)) in order, keeping up to READ_AHEAD reads
+    in flight on a thread pool so file I/O overlaps with scanning.
+    """
+    paths = iter(file_paths)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=READ_THREADS) as pool:
+        in_flight = deque((path, pool.submit(read_file_bytes, path))
+                          for path in itertools.islice(paths, READ_AHEAD))
+        while in_flight:
+            path, future = in_flight.popleft()
+            next_path = next(paths, None)
+            if next_path is not None:
+                in_flight.append((next_path, pool.submit(read_file_bytes, next_path)))
+            yield path, future
+
+def scan_header_file(file_path: str, classifier: IncludeClassifier, data: Optional[bytes] = None) -> ScanResult:
+    """
+    Read one header (unless its bytes are given) and classify its quoted includes.
+    Returns a ScanResult.
+    """
+    # Find all include statements
+    if data is None:
+        matches = extract_includes(file_path)
+    else:
+        matches = [match.group(1).decode('utf-8', 'replace')
+                   for match in INCLUDE_PATTERN_BYTES.finditer(data)]
+    
+    # Check each include path
+    issues = []
+    compliant = []
+    for include_path in matches:
+        issue_type = classify_include_path(classifier, include_path)
+        if issue_type is None:
+            compliant.append(include_path)
+        else:
+            issues.append((include_path, issue_type))
+    
+    return len(matches), issues, compliant
+
+# Classifier installed in each worker process by _init_worker
+_worker_classifier = None
+
+def _init_worker(classifier: IncludeClassifier) -> None:
+    global _worker_classifier
+    _worker_classifier = classifier
+
+def _validate_one(file_path: str, classifier: Optional[IncludeClassifier] = None,
+                  read: Optional[Callable[[], Tuple[bytes, Tuple[int, int]]]] = None):
+    """
+    Validate one header; safe to run in a worker process. read, if given,
+    returns read_file_bytes(file_path) (e.g. from a prefetch).
+    Returns (file_path, ScanResult or None, error message or None,
+    Fingerprint of the scanned bytes or None).
+    """
+    try:
+        data, (mtime_ns, size) = read() if read is not None else read_file_bytes(file_path)
+        result = scan_header_file(file_path, classifier or _worker_classifier, data)
+        return file_path, result, None, (mtime_ns, size, hashlib.sha256(data).hexdigest())
+    except Exception as e:
+        return file_path, None, str(e), None
+
+def _validate_chunk(file_paths: List[str]):
+    """Validate a chunk of headers in a worker process."""
+    return [_validate_one(file_path, read=future.result)
+            for file_path, future in iter_prefetched(file_paths)]
+
+def _file_size(file_path: str) -> int:
+    try:
+        return os.path.getsize(file_path)
+    except OSError:
+        return 0
+
+def balanced_chunks(file_paths: List[str], chunk_count: int) -> List[List[str]]:
+    """
+    Split files into chunks of similar total size: files are ordered largest
+    first and dealt out round-robin, so no chunk collects all the big headers.
+    """
+    by_size = sorted(file_paths, key=_file_size, reverse=True)
+    return [by_size[i::chunk_count] for i in range(chunk_count)]
+
 class IncludePathValidator:
     """Validates include paths in LibPolyCall header files."""
     
-    def __init__(self, project_root: str, verbose: bool = False, report_file: Optional[str] = None):
+    def __init__(self, project_root: str, verbose: bool = False, report_file: Optional[str] = None,
+                 jobs: Optional[int] = None, use_cache: bool = True, only_changed: Optional[str] = None):
         self.project_root = Path(project_root)
         self.include_dir = self.project_root / "include"
         self.report_file = report_file
+        self.jobs = jobs or os.cpu_count() or 1
+        self.use_cache = use_cache
+        self.only_changed = only_changed
+        self.cache_file = self.project_root / CACHE_DIR_NAME / CACHE_FILE_NAME
         
         if verbose:
             logger.setLevel(logging.DEBUG)
@@ -42,9 +288,15 @@ class IncludePathValidator:
         self.total_includes = 0
         self.non_compliant_includes = 0
         
-        # Track issues by type for reporting
-        self.issue_types = defaultdict(int)
-        self.issues_by_file = defaultdict(list)
+        # Non-compliant includes as parallel arrays, appended file by file;
+        # kinds index _issue_type_names
+        self._issue_files: List[str] = []
+        self._issue_paths: List[str] = []
+        self._issue_kinds = array('H')
+        
+        # Headers found by validate_all and their compliant includes, reused by check_header_paths
+        self._header_files: Optional[List[str]] = None
+        self.compliant_includes_by_file: Dict[str, List[str]] = {}
         
         # Define standard include path patterns
         self.valid_patterns = [
@@ -78,88 +330,300 @@ class IncludePathValidator:
             "missing_polycall_prefix_module": r"^(auth|config|ffi|protocol|network|micro|edge|telemetry)/.*\.h$",
             "wrong_module_path": r"^polycall/core/polycall/(auth|config|ffi|protocol|network|micro|edge|telemetry)/.*\.h$"
         }
+        
+        # Issue types as small ints, counted per type for reporting
+        self._issue_type_names = [*self.invalid_patterns, "unknown"]
+        self._issue_type_index = {issue_type: i for i, issue_type in enumerate(self._issue_type_names)}
+        self._issue_type_counts = array('L', [0] * len(self._issue_type_names))
+        
+        # Compiled once; the string forms above are kept for the report
+        self._valid_compiled = [re.compile(pattern) for pattern in self.valid_patterns]
+        self._invalid_compiled = [(issue_type, re.compile(pattern))
+                                  for issue_type, pattern in self.invalid_patterns.items()]
+        
+        # All patterns fused into one alternation, valid ones first, so a single
+        # match() classifies an include; the matched group name is the verdict
+        self._classifier = IncludeClassifier(re.compile('|'.join(
+            [f"(?P<valid_{i}>{pattern})" for i, pattern in enumerate(self.valid_patterns)] +
+            [f"(?P<{issue_type}>{pattern})" for issue_type, pattern in self.invalid_patterns.items()]
+        )), *derive_fast_paths(self.valid_patterns))
+        
+        # Cached results are only valid for the rule set that produced them
+        self._rules_hash = hashlib.sha256(
+            f"{CACHE_FORMAT}\0{INCLUDE_PATTERN.pattern}\0{self._classifier.pattern.pattern}".encode('utf-8')
+        ).hexdigest()
+        self._cache = self._load_cache() if use_cache else {}
+        self._cache_dirty = False
+    
+    def _load_cache(self) -> Dict[str, Dict]:
+        """
+        Load cached results, discarding them if the rule set has changed.
+        The file lives in the checkout, so it is plain JSON and every entry
+        is type-checked; malformed entries are dropped.
+        """
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cache {self.cache_file}: {e}")
+            return {}
+        
+        if not isinstance(data, dict) or data.get("rules_hash") != self._rules_hash:
+            logger.debug("Validation rules changed; starting with an empty cache")
+            return {}
+        files = data.get("files")
+        if not isinstance(files, dict):
+            return {}
+        
+        cache = {}
+        for file_path, entry in files.items():
+            entry = self._decode_cache_entry(entry)
+            if entry is not None:
+                cache[file_path] = entry
+        return cache
+    
+    def _decode_cache_entry(self, entry) -> Optional[Dict]:
+        """Rebuild a cache entry read from JSON (tuples come back as lists), or None if malformed."""
+        try:
+            (mtime_ns, size), digest, (include_count, issues, compliant) = (
+                entry["stat"], entry["digest"], entry["result"])
+            issues = [(include_path, issue_type) for include_path, issue_type in issues]
+        except (TypeError, KeyError, ValueError):
+            return None
+        
+        if not (all(type(value) is int for value in (mtime_ns, size, include_count))
+                and isinstance(digest, str)
+                and all(isinstance(include_path, str) and isinstance(issue_type, str)
+                        and issue_type in self._issue_type_index
+                        for include_path, issue_type in issues)
+                and isinstance(compliant, list)
+                and all(isinstance(include_path, str) for include_path in compliant)):
+            return None
+        return {
+            "stat": (mtime_ns, size),
+            "digest": digest,
+            "result": (include_count, issues, compliant)
+        }
+    
+    def save_cache(self):
+        """Persist cached results if anything changed during this run."""
+        if not self.use_cache or not self._cache_dirty:
+            return
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.cache_file.with_suffix('.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump({"rules_hash": self._rules_hash, "files": self._cache}, f)
+            os.replace(tmp_file, self.cache_file)
+            self._cache_dirty = False
+        except OSError as e:
+            logger.warning(f"Could not write cache {self.cache_file}: {e}")
+    
+    def _cached_result(self, file_path: str) -> Optional[ScanResult]:
+        """
+        Return the cached scan result for a file, or None.
+        An unchanged (mtime, size) replays the result without opening the file;
+        otherwise the entry still applies if the content digest matches.
+        """
+        entry = self._cache.get(file_path)
+        if entry is None:
+            return None
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return None
+        
+        stat_key = (st.st_mtime_ns, st.st_size)
+        if entry["stat"] == stat_key:
+            return entry["result"]
+        
+        try:
+            digest = file_content_digest(file_path)
+        except OSError:
+            return None
+        if digest != entry["digest"]:
+            return None
+        
+        # Touched but unchanged: refresh the stat so the next run takes the fast path
+        entry["stat"] = stat_key
+        self._cache_dirty = True
+        return entry["result"]
+    
+    def _store_result(self, file_path: str, result: ScanResult, fingerprint: Fingerprint):
+        """Remember a freshly computed result for a file, keyed to the bytes it was scanned from."""
+        if not self.use_cache:
+            return
+        mtime_ns, size, digest = fingerprint
+        self._cache[file_path] = {
+            "stat": (mtime_ns, size),
+            "digest": digest,
+            "result": result
+        }
+        self._cache_dirty = True
     
-    def find_header_files(self) -> List[Path]:
-        """Find all header files in the include directory."""
+    def find_header_files(self, changed_only: bool = True) -> List[str]:
+        """
+        Find all header files in the include directory, or with only_changed
+        set (and changed_only left true), those changed since that git base.
+        """
         if not self.include_dir.exists():
             logger.error(f"Include directory not found: {self.include_dir}")
             return []
         
-        header_files = list(self.include_dir.glob("**/*.h"))
+        if self.only_changed and changed_only:
+            try:
+                changed = git_changed_files(str(self.project_root), self.only_changed, ["include/*.h"])
+            except (OSError, subprocess.CalledProcessError) as e:
+                logger.warning(f"Cannot list changes since {self.only_changed}, checking all headers: {e}")
+            else:
+                header_files = sorted(path for path in (str(self.project_root / rel_path) for rel_path in changed)
+                                      if os.path.isfile(path))
+                logger.info(f"Found {len(header_files)} header files changed since {self.only_changed}")
+                return header_files
+        
+        header_files = sorted(iter_header_files(str(self.include_dir)))
         logger.info(f"Found {len(header_files)} header files")
         return header_files
     
     def is_valid_include(self, include_path: str) -> bool:
         """Check if an include path follows standard patterns."""
-        # Check against valid patterns
-        for pattern in self.valid_patterns:
-            if re.match(pattern, include_path):
-                return True
-        
-        return False
+        # Valid patterns come first in the classifier, so a match on any of them wins
+        return self.classify_include(include_path) is None
     
     def get_issue_type(self, include_path: str) -> str:
         """Identify the specific issue with a non-compliant include path."""
-        for issue_type, pattern in self.invalid_patterns.items():
-            if re.match(pattern, include_path):
+        issue_type = self.classify_include(include_path)
+        if issue_type is not None:
+            return issue_type
+        
+        # Compliant path: report which invalid pattern, if any, it would also match
+        for issue_type, pattern in self._invalid_compiled:
+            if pattern.match(include_path):
                 return issue_type
         
         return "unknown"
     
-    def validate_file(self, file_path: Path) -> Tuple[bool, List[Dict]]:
+    def classify_include(self, include_path: str) -> Optional[str]:
+        """Return None for a compliant include path, otherwise its issue type."""
+        return classify_include_path(self._classifier, include_path)
+    
+    @property
+    def issue_types(self) -> Dict[str, int]:
+        """Occurrences per issue type, in order of first occurrence."""
+        return {self._issue_type_names[kind]: self._issue_type_counts[kind]
+                for kind in dict.fromkeys(self._issue_kinds)}
+    
+    @property
+    def issues_by_file(self) -> Dict[str, List[Tuple[str, str]]]:
+        """Non-compliant (include path, issue type) pairs grouped by relative file path."""
+        grouped = {}
+        for file_path, indices in itertools.groupby(range(len(self._issue_files)),
+                                                    key=self._issue_files.__getitem__):
+            grouped[file_path] = [(self._issue_paths[i], self._issue_type_names[self._issue_kinds[i]])
+                                  for i in indices]
+        return grouped
+    
+    def _record_result(self, file_path: str, result: Optional[ScanResult], error: Optional[str]) -> bool:
+        """Fold one file's scan result into the statistics. Returns whether the file is valid."""
+        if error is not None:
+            logger.error(f"Error validating {file_path}: {error}")
+            return False
+        
+        include_count, issues, compliant = result
+        self.total_includes += include_count
+        self.compliant_includes_by_file[file_path] = compliant
+        
+        if issues:
+            # The same include strings recur across files; keep one copy of each
+            rel_file = sys.intern(os.path.relpath(file_path, self.project_root))
+            for include_path, issue_type in issues:
+                kind = self._issue_type_index[issue_type]
+                self._issue_type_counts[kind] += 1
+                self._issue_files.append(rel_file)
+                self._issue_paths.append(sys.intern(include_path))
+                self._issue_kinds.append(kind)
+            self.non_compliant_includes += len(issues)
+        
+        return not issues
+    
+    def validate_file(self, file_path: str) -> Tuple[bool, List[Dict]]:
         """
-        Validate include paths in a single file.
+        Validate include paths in a single file. New results are cached in
+        memory; call save_cache() once done validating files one by one.
         Returns (is_valid, list of issues).
         """
         logger.debug(f"Validating file: {file_path}")
         
-        issues = []
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Find all include statements
-            include_pattern = re.compile(r'#\s*include\s+"([^"]+)"')
-            matches = include_pattern.findall(content)
-            
-            self.total_includes += len(matches)
-            
-            # Check each include path
-            for include_path in matches:
-                if not self.is_valid_include(include_path):
-                    issue_type = self.get_issue_type(include_path)
-                    issues.append({
-                        "path": include_path,
-                        "issue_type": issue_type,
-                        "file": str(file_path.relative_to(self.project_root))
-                    })
-                    
-                    self.issue_types[issue_type] += 1
-                    self.non_compliant_includes += 1
-            
-            if issues:
-                self.issues_by_file[str(file_path.relative_to(self.project_root))] = issues
-            
-            return len(issues) == 0, issues
-            
-        except Exception as e:
-            logger.error(f"Error validating {file_path}: {e}")
-            return False, [{"path": "", "issue_type": "error", "file": str(file_path)}]
+        result = self._cached_result(file_path)
+        error = None
+        if result is None:
+            _, result, error, fingerprint = _validate_one(file_path, self._classifier)
+            if error is None:
+                self._store_result(file_path, result, fingerprint)
+        
+        is_valid = self._record_result(file_path, result, error)
+        if error is not None:
+            return is_valid, [{"path": "", "issue_type": "error", "file": file_path}]
+        
+        rel_file = os.path.relpath(file_path, self.project_root)
+        return is_valid, [{"path": include_path, "issue_type": issue_type, "file": rel_file}
+                          for include_path, issue_type in result[1]]
     
     def validate_all(self) -> bool:
-        """Validate all header files."""
-        header_files = self.find_header_files()
+        """
+        Validate all header files. Files whose cached result still applies are
+        not rescanned; with more than one job, the rest are scanned in worker
+        processes and the results merged here.
+        """
+        header_files = self._header_files = self.find_header_files()
         if not header_files:
+            if self.only_changed and self.include_dir.exists():
+                logger.info(f"No headers changed since {self.only_changed}")
+                return True
             logger.error("No header files found")
             return False
         
         all_valid = True
         
+        results = {}
+        pending = []
+        for file_path in header_files:
+            cached = self._cached_result(file_path)
+            if cached is not None:
+                results[file_path] = (file_path, cached, None, None)
+            else:
+                pending.append(file_path)
+        logger.debug(f"{len(header_files) - len(pending)} headers served from cache, {len(pending)} to scan")
+        
+        if self.jobs > 1 and len(pending) > 1:
+            chunksize = max(1, min(64, len(pending) // (self.jobs * 4)))
+            chunks = balanced_chunks(pending, -(-len(pending) // chunksize))
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.jobs,
+                initializer=_init_worker,
+                initargs=(self._classifier,)
+            ) as executor:
+                futures = [executor.submit(_validate_chunk, chunk) for chunk in chunks]
+                # Merge chunks as they finish rather than in submission order
+                for future in concurrent.futures.as_completed(futures):
+                    for scanned in future.result():
+                        results[scanned[0]] = scanned
+        else:
+            for file_path, future in iter_prefetched(pending):
+                results[file_path] = _validate_one(file_path, self._classifier, read=future.result)
+        
+        for file_path in pending:
+            _, result, error, fingerprint = results[file_path]
+            if error is None:
+                self._store_result(file_path, result, fingerprint)
+        self.save_cache()
+        
         for file_path in header_files:
+            _, result, error, _ = results[file_path]
             self.files_processed += 1
-            is_valid, issues = self.validate_file(file_path)
-            
-            if not is_valid:
+            if not self._record_result(file_path, result, error):
                 all_valid = False
                 self.files_with_issues += 1
         
@@ -193,8 +657,8 @@ class IncludePathValidator:
             for file_path, issues in sorted_files[:5]:
                 logger.info(f"  {file_path}: {len(issues)} issues")
                 # Show up to 3 example issues per file
-                for issue in issues[:3]:
-                    logger.info(f"    - {issue['path']} ({issue['issue_type']})")
+                for include_path, issue_type in issues[:3]:
+                    logger.info(f"    - {include_path} ({issue_type})")
                 if len(issues) > 3:
                     logger.info(f"    - ... and {len(issues) - 3} more")
     
@@ -218,8 +682,8 @@ class IncludePathValidator:
                     f.write("\n## All non-compliant includes\n\n")
                     for file_path, issues in sorted(self.issues_by_file.items()):
                         f.write(f"### {file_path}\n\n")
-                        for issue in issues:
-                            f.write(f"- `{issue['path']}` ({issue['issue_type']})\n")
+                        for include_path, issue_type in issues:
+                            f.write(f"- `{include_path}` ({issue_type})\n")
                         f.write("\n")
                 
                 f.write("\n## Validation Rules\n\n")
@@ -242,36 +706,32 @@ class IncludePathValidator:
         based on their include paths.
         """
         logger.info("Checking physical header file paths...")
-        header_files = self.find_header_files()
+        header_files = self._header_files if self._header_files is not None else self.find_header_files()
         issues = 0
         
-        # Map from relative path to actual file
-        path_map = {}
-        for file_path in header_files:
-            rel_path = str(file_path.relative_to(self.include_dir))
-            path_map[rel_path] = file_path
+        # Include-relative paths of the headers that exist; only membership is needed.
+        # Changed headers may include any header, so this always covers the whole tree.
+        include_dir = str(self.include_dir)
+        all_headers = self.find_header_files(changed_only=False) if self.only_changed else header_files
+        existing = frozenset(os.path.relpath(file_path, include_dir).replace(os.sep, '/')
+                             for file_path in all_headers)
         
         # Check each include reference
         for file_path in header_files:
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
+                # Reuse the includes found by validate_all; scan only headers it did not see
+                compliant = self.compliant_includes_by_file.get(file_path)
+                if compliant is None:
+                    compliant = [include_path for include_path in extract_includes(file_path)
+                                 if self.is_valid_include(include_path)]
                 
-                # Find all include statements 
-                include_pattern = re.compile(r'#\s*include\s+"([^"]+)"')
-                matches = include_pattern.findall(content)
-                
-                for include_path in matches:
+                for include_path in compliant:
                     # Skip system includes
                     if include_path.startswith("<") and include_path.endswith(">"):
                         continue
                     
-                    # Skip if already known to be non-standard
-                    if not self.is_valid_include(include_path):
-                        continue
-                    
                     # Check if file exists at expected location
-                    if include_path not in path_map:
+                    if include_path not in existing:
                         logger.warning(f"Header not found: {include_path} (referenced in {file_path})")
                         issues += 1
             
@@ -291,13 +751,19 @@ def main():
     parser.add_argument("--verbose", action="store_true", help="Enable verbose logging")
     parser.add_argument("--report", help="Write detailed report to specified file")
     parser.add_argument("--check-paths", action="store_true", help="Check physical header file paths")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="Number of worker processes for validation")
+    parser.add_argument("--no-cache", action="store_true", help=f"Ignore and do not update the {CACHE_DIR_NAME} result cache")
+    parser.add_argument("--only-changed", metavar="BASE", help="Only validate headers changed between the merge base of BASE and HEAD")
     
     args = parser.parse_args()
     
     validator = IncludePathValidator(
         project_root=args.project_root,
         verbose=args.verbose,
-        report_file=args.report
+        report_file=args.report,
+        jobs=args.jobs,
+        use_cache=not args.no_cache,
+        only_changed=args.only_changed
     )
     
     # Validate includes
@@ -16,6 +16,9 @@ import platform
 import argparse
 import subprocess
 import re
+import hashlib
+import functools
+import concurrent.futures
 from pathlib import Path
 from typing import Dict, List, Set, Tuple, Optional
 from datetime import datetime
@@ -24,9 +27,42 @@ from datetime import datetime
 class PolycallBuildOrchestrator:
     """Orchestrates LibPolyCall build process with standardized output structure."""
     
-    def __init__(self, project_root: str, verbose: bool = False):
+    # Common incorrect include patterns and their fixes: each alternative
+    # captures the path and INCLUDE_FIX_TEMPLATES[group - 1] rebuilds it
+    INCLUDE_FIX_PATTERN = re.compile(
+        r'"libpolycall/([^"\n]+)"'
+        r'|<libpolycall/([^>\n]+)>'
+        r'|"core/([^"\n]+)"'
+        r'|"cli/([^"\n]+)"'
+        r'|"\.\./include/([^"\n]+)"'
+        r'|"\.\./\.\./include/([^"\n]+)"'
+    )
+    INCLUDE_FIX_TEMPLATES = (
+        '"polycall/{}"',
+        '<polycall/{}>',
+        '"polycall/core/{}"',
+        '"polycall/cli/{}"',
+        '"{}"',
+        '"{}"',
+    )
+    
+    # Every fix needs one of these in the raw bytes, so files without any
+    # are skipped before decoding
+    INCLUDE_FIX_NEEDLES = (
+        b'"libpolycall/', b'<libpolycall/', b'"core/', b'"cli/',
+        b'"../include/', b'"../../include/',
+    )
+    
+    # Identifies the fix rules a cached include-fix result was produced with
+    INCLUDE_FIXES_DIGEST = hashlib.sha1(
+        repr((INCLUDE_FIX_PATTERN.pattern, INCLUDE_FIX_TEMPLATES)).encode()
+    ).hexdigest()
+    
+    def __init__(self, project_root: str, verbose: bool = False, jobs: Optional[int] = None):
         self.project_root = Path(project_root).resolve()
         self.verbose = verbose
+        self.jobs = jobs or os.cpu_count() or 1
+        self.dry_run = False
         
         # Build output structure - centralized in build/
         self.build_root = self.project_root / "build"
@@ -69,6 +105,33 @@ class PolycallBuildOrchestrator:
         # Compilation tracking
         self.compilation_db = []
         
+        # Source mtimes (ns) as of their last include fix; unchanged sources
+        # are not scanned again
+        self.include_fix_cache_file = self.build_root / ".include_fix_cache.json"
+        self.include_fix_cache = self.load_include_fix_cache()
+        
+    def load_include_fix_cache(self) -> Dict[str, int]:
+        """Load the include-fix mtime cache, discarding it if the fix rules changed."""
+        try:
+            with open(self.include_fix_cache_file) as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        
+        if not isinstance(cache, dict) or cache.get("rules") != self.INCLUDE_FIXES_DIGEST:
+            return {}
+        return cache.get("files", {})
+    
+    def save_include_fix_cache(self):
+        """Write the include-fix mtime cache atomically."""
+        temp_file = self.include_fix_cache_file.with_suffix(".tmp")
+        try:
+            with open(temp_file, 'w') as f:
+                json.dump({"rules": self.INCLUDE_FIXES_DIGEST, "files": self.include_fix_cache}, f)
+            os.replace(temp_file, self.include_fix_cache_file)
+        except OSError as e:
+            print(f"  Warning: could not save include fix cache: {e}")
+    
     def setup_build_directories(self):
         """Create standardized build directory structure."""
         print("=== Setting up build directories ===")
@@ -95,38 +158,43 @@ class PolycallBuildOrchestrator:
             if self.verbose:
                 print(f"  Created: {dir_path}")
     
+    @classmethod
+    def _fix_include(cls, match: re.Match) -> str:
+        """Rewrite one matched include path with the template for its rule."""
+        return cls.INCLUDE_FIX_TEMPLATES[match.lastindex - 1].format(match.group(match.lastindex))
+    
     def fix_include_paths(self, source_file: Path) -> List[str]:
         """
         Fix include paths in source file to ensure proper polycall/ prefix.
         Returns list of fixed includes.
         """
         fixed_includes = []
-        content = source_file.read_text()
-        
-        # Pattern to match includes
-        include_pattern = r'#include\s*[<"](.+?)[>"]'
-        
-        # Common incorrect patterns and their fixes
-        fixes = {
-            r'"libpolycall/(.+)"': r'"polycall/\1"',
-            r'<libpolycall/(.+)>': r'<polycall/\1>',
-            r'"core/(.+)"': r'"polycall/core/\1"',
-            r'"cli/(.+)"': r'"polycall/cli/\1"',
-            r'"../include/(.+)"': r'"\1"',
-            r'"../../include/(.+)"': r'"\1"',
-        }
+        cache_key = str(source_file)
         
+        # Skip files untouched since they were last fixed
+        mtime_ns = source_file.stat().st_mtime_ns
+        if self.include_fix_cache.get(cache_key) == mtime_ns:
+            return fixed_includes
+        
+        raw = source_file.read_bytes()
         modified = False
-        for pattern, replacement in fixes.items():
-            new_content = re.sub(pattern, replacement, content)
-            if new_content != content:
-                modified = True
-                content = new_content
+        if any(needle in raw for needle in self.INCLUDE_FIX_NEEDLES):
+            # Decode as text mode would, with universal newlines
+            content = raw.decode()
+            if b'\r' in raw:
+                content = content.replace('\r\n', '\n').replace('\r', '\n')
+            
+            content, fixes = self.INCLUDE_FIX_PATTERN.subn(self._fix_include, content)
+            modified = fixes > 0
         
-        if modified and not self.dry_run:
+        if modified:
+            if self.dry_run:
+                return fixed_includes
             source_file.write_text(content)
             fixed_includes.append(str(source_file))
+            mtime_ns = source_file.stat().st_mtime_ns
         
+        self.include_fix_cache[cache_key] = mtime_ns
         return fixed_includes
     
     def stage_headers(self):
@@ -144,27 +212,20 @@ class PolycallBuildOrchestrator:
             shutil.copytree(polycall_include, dest, dirs_exist_ok=True)
             print(f"  Staged headers to: {dest}")
     
-    def compile_module(self, module_type: str, module_name: str, config: str = "debug") -> bool:
+    def _plan_module(self, module_type: str, module_name: str,
+                     config: str = "debug") -> Optional[List[Tuple[Path, Path, List[str]]]]:
         """
-        Compile a specific module with proper include paths.
-        Returns True if successful.
+        Work out the compile command for every source file in a module and
+        record it in the compilation database.
+        Returns (source, object, command) triples, or None if the module
+        source directory does not exist.
         """
         module_src = self.src_dir / module_type / module_name
         module_obj = self.obj_dir / module_type / module_name
         
         if not module_src.exists():
-            if self.verbose:
-                print(f"  Module source not found: {module_src}")
-            return False
-        
-        # Find all C files in module
-        c_files = list(module_src.glob("*.c"))
-        if not c_files:
-            return True  # No source files to compile
-        
-        print(f"  Compiling {module_type}/{module_name} ({len(c_files)} files)")
+            return None
         
-        # Compile each source file
         cc = os.environ.get("CC", "gcc")
         cflags = self.configs[config]["cflags"]
         include_flags = [
@@ -173,22 +234,17 @@ class PolycallBuildOrchestrator:
             f"-I{self.src_dir}"
         ]
         
-        success = True
-        for c_file in c_files:
+        plan = []
+        for c_file in module_src.glob("*.c"):
             obj_file = module_obj / c_file.with_suffix(".o").name
             
-            # Fix includes before compiling
-            self.fix_include_paths(c_file)
-            
-            # Compile command
+            # Compile command; gcc also writes the headers it read to a .d file
             cmd = [cc] + cflags.split() + include_flags + [
+                "-MMD", "-MF", str(obj_file.with_suffix(".d")),
                 "-c", str(c_file),
                 "-o", str(obj_file)
             ]
             
-            if self.verbose:
-                print(f"    {' '.join(cmd)}")
-            
             # Track compilation command
             self.compilation_db.append({
                 "directory": str(self.project_root),
@@ -196,17 +252,142 @@ class PolycallBuildOrchestrator:
                 "file": str(c_file)
             })
             
-            # Execute compilation
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode != 0:
+            plan.append((c_file, obj_file, cmd))
+        
+        return plan
+    
+    @staticmethod
+    def _deps_up_to_date(dep_file: Path, obj_mtime_ns: int) -> bool:
+        """
+        Check a gcc -MMD dependency file: True if every prerequisite it lists
+        still exists and is not newer than the object file.
+        """
+        try:
+            text = dep_file.read_text()
+        except OSError:
+            return False
+        
+        _, _, prerequisites = text.replace("\\\n", " ").partition(":")
+        for dep in re.split(r'(?<!\\)\s+', prerequisites.strip()):
+            if not dep:
+                continue
+            try:
+                if os.stat(dep.replace("\\ ", " ")).st_mtime_ns > obj_mtime_ns:
+                    return False
+            except OSError:
+                return False
+        return True
+    
+    def _object_up_to_date(self, c_file: Path, obj_file: Path, command_line: str) -> bool:
+        """
+        True if obj_file was built by the same command and is newer than its
+        source and every header recorded in its dependency file.
+        """
+        try:
+            obj_mtime_ns = obj_file.stat().st_mtime_ns
+            if c_file.stat().st_mtime_ns > obj_mtime_ns:
+                return False
+            if obj_file.with_suffix(".cmd").read_text() != command_line:
+                return False
+        except OSError:
+            return False
+        
+        return self._deps_up_to_date(obj_file.with_suffix(".d"), obj_mtime_ns)
+    
+    def _compile_one(self, c_file: Path, obj_file: Path, cmd: List[str]) -> Tuple[bool, str, bool]:
+        """
+        Fix includes in one source file and compile it unless its object
+        is already up to date.
+        Returns (success, compiler stderr, whether the object was up to date).
+        """
+        self.fix_include_paths(c_file)
+        
+        command_line = " ".join(cmd)
+        if self._object_up_to_date(c_file, obj_file, command_line):
+            return True, "", True
+        
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        if result.returncode == 0:
+            # Remember the command so a change of flags forces a rebuild
+            obj_file.with_suffix(".cmd").write_text(command_line)
+        return result.returncode == 0, result.stderr, False
+    
+    def _report_module(self, module_type: str, module_name: str,
+                       plan: Optional[List[Tuple[Path, Path, List[str]]]],
+                       futures: List[concurrent.futures.Future]) -> bool:
+        """
+        Wait for a module's compilations and report them in source order.
+        Returns True if every file compiled.
+        """
+        if plan is None:
+            if self.verbose:
+                print(f"  Module source not found: {self.src_dir / module_type / module_name}")
+            return False
+        
+        if not plan:
+            return True  # No source files to compile
+        
+        print(f"  Compiling {module_type}/{module_name} ({len(plan)} files)")
+        
+        success = True
+        for (c_file, obj_file, cmd), future in zip(plan, futures):
+            if self.verbose:
+                print(f"    {' '.join(cmd)}")
+            
+            compiled, stderr, up_to_date = future.result()
+            if not compiled:
                 print(f"    Error compiling {c_file.name}:")
-                print(result.stderr)
+                print(stderr)
                 success = False
+            elif up_to_date:
+                print(f"    ✓ {c_file.name} -> {obj_file.name} (up to date)")
             else:
                 print(f"    ✓ {c_file.name} -> {obj_file.name}")
         
         return success
     
+    def compile_module(self, module_type: str, module_name: str, config: str = "debug") -> bool:
+        """
+        Compile a specific module with proper include paths.
+        Returns True if successful.
+        """
+        plan = self._plan_module(module_type, module_name, config)
+        
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            futures = [executor.submit(self._compile_one, c_file, obj_file, cmd) for c_file, obj_file, cmd in plan or []]
+            return self._report_module(module_type, module_name, plan, futures)
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _linker_supported(cc: str, linker: str) -> bool:
+        """
+        Check once per compiler whether it accepts -fuse-ld=<linker>
+        (GCC only knows mold from 12.1) and the linker can be run.
+        """
+        if not shutil.which(linker):
+            return False
+        try:
+            result = subprocess.run(
+                [cc, f"-fuse-ld={linker}", "-Wl,--version"],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL
+            )
+        except OSError:
+            return False
+        return result.returncode == 0
+    
+    @staticmethod
+    def _write_response_file(path: Path, args: List[str]) -> str:
+        """
+        Write args to a response file, one quoted argument per line, and
+        return the @file argument that makes ar/gcc read them from it.
+        """
+        def quote(arg: str) -> str:
+            return '"' + arg.replace('\\', '\\\\').replace('"', '\\"') + '"'
+        
+        path.write_text("".join(quote(arg) + "\n" for arg in args))
+        return f"@{path}"
+    
     def link_library(self, config: str = "debug"):
         """Link all object files into static and shared libraries."""
         print("=== Linking libraries ===")
@@ -219,11 +400,18 @@ class PolycallBuildOrchestrator:
         
         print(f"  Found {len(obj_files)} object files")
         
-        # Create static library
+        # Object paths go through a response file so the command lines stay
+        # short however many objects there are
+        objects_arg = self._write_response_file(self.lib_dir / "objects.rsp", [str(f) for f in obj_files])
+        
+        # Create static library; start from an empty archive so members of
+        # objects that no longer exist do not linger
         ar = os.environ.get("AR", "ar")
         static_lib_path = self.lib_dir / self.static_lib
+        if static_lib_path.exists():
+            static_lib_path.unlink()
         
-        cmd = [ar, "rcs", str(static_lib_path)] + [str(f) for f in obj_files]
+        cmd = [ar, "rcs", str(static_lib_path), objects_arg]
         if self.verbose:
             print(f"  Static library: {' '.join(cmd[:3])} ... ({len(obj_files)} objects)")
         
@@ -238,7 +426,11 @@ class PolycallBuildOrchestrator:
         cc = os.environ.get("CC", "gcc")
         shared_lib_path = self.lib_dir / self.shared_lib
         
-        cmd = [cc, "-shared", "-o", str(shared_lib_path)] + [str(f) for f in obj_files]
+        cmd = [cc, "-shared", "-o", str(shared_lib_path), objects_arg]
+        
+        # Prefer the mold linker when it is installed and the compiler supports it
+        if self._linker_supported(cc, "mold"):
+            cmd.insert(1, "-fuse-ld=mold")
         if self.verbose:
             print(f"  Shared library: {' '.join(cmd[:4])} ... ({len(obj_files)} objects)")
         
@@ -310,15 +502,26 @@ class PolycallBuildOrchestrator:
         self.setup_build_directories()
         self.stage_headers()
         
-        # Compile core modules
-        print("\n=== Compiling core modules ===")
-        for module in self.core_modules:
-            self.compile_module("core", module, config)
+        # Compile core and CLI modules. Every source file is queued on one
+        # pool so compilations overlap across modules; results are still
+        # reported module by module.
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            sections = []
+            for module_type, title, modules in (("core", "core", self.core_modules),
+                                                ("cli", "CLI", self.cli_modules)):
+                submitted = []
+                for module in modules:
+                    plan = self._plan_module(module_type, module, config)
+                    futures = [executor.submit(self._compile_one, c_file, obj_file, cmd) for c_file, obj_file, cmd in plan or []]
+                    submitted.append((module, plan, futures))
+                sections.append((module_type, title, submitted))
+            
+            for module_type, title, submitted in sections:
+                print(f"\n=== Compiling {title} modules ===")
+                for module, plan, futures in submitted:
+                    self._report_module(module_type, module, plan, futures)
         
-        # Compile CLI modules
-        print("\n=== Compiling CLI modules ===")
-        for module in self.cli_modules:
-            self.compile_module("cli", module, config)
+        self.save_include_fix_cache()
         
         # Link libraries
         if not self.link_library(config):
@@ -376,13 +579,20 @@ def main():
         action="store_true",
         help="Enable verbose output"
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count(),
+        help="Number of files to compile in parallel (default: CPU count)"
+    )
     
     args = parser.parse_args()
     
     # Initialize orchestrator
     orchestrator = PolycallBuildOrchestrator(
         project_root=args.project_root,
-        verbose=args.verbose
+        verbose=args.verbose,
+        jobs=args.jobs
     )
     
     # Execute requested action
@@ -8,8 +8,14 @@ import subprocess
 import glob
 import argparse
 import shutil
+import shlex
+import re
+import hashlib
+import tempfile
+import functools
 import logging
-from typing import List, Dict, Optional, Tuple
+import concurrent.futures
+from typing import List, Dict, Iterator, Optional, Tuple
 
 # Configure logging
 logging.basicConfig(
@@ -19,11 +25,25 @@ logging.basicConfig(
 )
 logger = logging.getLogger('build_command_tests')
 
+# Directories already ensured by this process
+_ensured_directories = set()
+
+# Content-addressed object cache, kept under the object directory
+BUILD_CACHE_DIR = '.build_cache'
+
 def ensure_directory_exists(directory: str) -> None:
     """Ensure the specified directory exists, creating it if necessary."""
-    if not os.path.exists(directory):
-        os.makedirs(directory, exist_ok=True)
+    if directory in _ensured_directories:
+        return
+    
+    try:
+        os.makedirs(directory)
         logger.info(f"Created directory: {directory}")
+    except FileExistsError:
+        if not os.path.isdir(directory):
+            raise
+    
+    _ensured_directories.add(directory)
 
 def detect_compiler() -> str:
     """Detect the appropriate C compiler to use."""
@@ -35,65 +55,250 @@ def detect_compiler() -> str:
         logger.warning("Neither gcc nor clang found, defaulting to 'cc'")
         return "cc"
 
-def run_command(cmd: str, cwd: Optional[str] = None) -> Tuple[int, str, str]:
-    """Run a command and return exit code, stdout, and stderr."""
-    process = subprocess.Popen(
-        cmd, 
-        shell=True, 
-        stdout=subprocess.PIPE, 
-        stderr=subprocess.PIPE,
-        cwd=cwd,
-        universal_newlines=True
-    )
-    stdout, stderr = process.communicate()
-    return process.returncode, stdout, stderr
+def detect_compiler_launcher(use_ccache: bool = True) -> Optional[str]:
+    """
+    Detect ccache to wrap compile commands with. ccache honours CCACHE_DIR
+    and the other CCACHE_* settings from the environment.
+    """
+    if not use_ccache:
+        return None
+    
+    return shutil.which("ccache")
 
-def compile_source_to_object(
+def run_command(
+    cmd: List[str],
+    cwd: Optional[str] = None,
+    capture_stdout: bool = True
+) -> Tuple[int, str, str]:
+    """
+    Run a command (as an argv list, without a shell) and return exit code, stdout, and stderr.
+    
+    With capture_stdout=False stdout is discarded and returned as an empty string.
+    A program that cannot be run is reported with exit code 127, as a shell would.
+    """
+    try:
+        process = subprocess.run(
+            cmd,
+            stdout=subprocess.PIPE if capture_stdout else subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            cwd=cwd,
+            universal_newlines=True,
+            check=False
+        )
+    except OSError as e:
+        return 127, '', str(e)
+    return process.returncode, process.stdout or '', process.stderr
+
+def make_compile_prefix(
     compiler: str,
+    include_flags: List[str],
+    launcher: Optional[str] = None
+) -> Tuple[str, ...]:
+    """Build the argv prefix shared by every compile invocation, optionally behind a launcher such as ccache."""
+    launcher_args = (launcher,) if launcher else ()
+    return (*launcher_args, compiler, "-c", *include_flags, "-DUNIT_TESTING", "-MMD")
+
+def object_paths(source_file: str, obj_dir: str) -> Tuple[str, str]:
+    """Return the object file and dependency file paths for a source file."""
+    base_name = os.path.basename(source_file)[:-2]  # Remove .c
+    obj_file = os.path.join(obj_dir, f"{base_name}.o")
+    return obj_file, f"{obj_file}.d"
+
+def compile_command(
+    compile_prefix: Tuple[str, ...],
+    source_file: str,
+    obj_file: str,
+    dep_file: str,
+    extra_flags: Optional[List[str]] = None
+) -> List[str]:
+    """Construct the compile command for a single source file."""
+    return [*compile_prefix, *(extra_flags or []), source_file, "-o", obj_file, "-MF", dep_file]
+
+def reuse_existing_object(cmd: List[str], source_file: str, obj_file: str, dep_file: str, cache_dir: str) -> bool:
+    """
+    Check whether a compile can be skipped: either the object was built by
+    the same command and is newer than every file listed in its dependency
+    file, or an object built from identical inputs is found in the build
+    cache (timestamps are unreliable across branch switches). Returns True
+    when obj_file is usable as is.
+    """
+    if is_object_up_to_date(obj_file, dep_file, cmd):
+        logger.info(f"Up to date: {obj_file}")
+        return True
+    
+    if restore_from_build_cache(cache_dir, compute_cache_key(cmd, source_file, dep_file), obj_file, dep_file):
+        record_compile_command(obj_file, cmd)
+        logger.info(f"Restored {obj_file} from build cache")
+        return True
+    
+    # Never write through a hard link into the cache
+    for path in (obj_file, dep_file):
+        if os.path.lexists(path):
+            os.unlink(path)
+    
+    return False
+
+def compile_source_to_object(
+    compile_prefix: Tuple[str, ...],
     source_file: str,
     obj_dir: str,
-    include_flags: str,
-    extra_flags: str = ""
+    extra_flags: Optional[List[str]] = None
 ) -> Optional[str]:
     """
     Compile a source file to an object file.
     
+    compile_prefix is the shared argv prefix from make_compile_prefix.
+    
+    The compiler also writes a dependency file next to the object, and the
+    command is recorded beside it; the compile is skipped when the object was
+    built by the same command and is newer than every file listed there, or
+    when an object built from identical inputs is found in the build cache.
+    
     Returns the path to the object file if successful, None otherwise.
     """
-    # Create base name and object file path
-    base_name = os.path.basename(source_file)[:-2]  # Remove .c
-    obj_file = os.path.join(obj_dir, f"{base_name}.o")
+    obj_file, dep_file = object_paths(source_file, obj_dir)
     
     # Create the object directory structure if it doesn't exist
     ensure_directory_exists(os.path.dirname(obj_file))
     
-    # Construct the compile command
-    cmd = f"{compiler} -c {source_file} -o {obj_file} {include_flags} {extra_flags} -DUNIT_TESTING"
+    cmd = compile_command(compile_prefix, source_file, obj_file, dep_file, extra_flags)
+    cache_dir = os.path.join(obj_dir, BUILD_CACHE_DIR)
+    if reuse_existing_object(cmd, source_file, obj_file, dep_file, cache_dir):
+        return obj_file
     
     # Execute the compile command
     logger.info(f"Compiling {source_file} to {obj_file}")
-    returncode, stdout, stderr = run_command(cmd)
+    # Only diagnostics on stderr are of interest for compiles and links
+    returncode, _, stderr = run_command(cmd, capture_stdout=False)
     
     if returncode != 0:
         logger.error(f"Compilation failed for {source_file}")
-        logger.error(f"Command: {cmd}")
+        logger.error(f"Command: {shlex.join(cmd)}")
         logger.error(f"Error: {stderr}")
         return None
     
+    record_compile_command(obj_file, cmd)
+    store_in_build_cache(cache_dir, compute_cache_key(cmd, source_file, dep_file), obj_file, dep_file)
+    
     logger.info(f"Successfully compiled {source_file} to {obj_file}")
     return obj_file
 
+def compile_batch(
+    compile_prefix: Tuple[str, ...],
+    source_files: List[str],
+    obj_dir: str
+) -> List[Optional[str]]:
+    """
+    Compile several source files with a single compiler invocation to
+    amortize process start-up. The compiler runs in a scratch directory
+    (there is one -o per invocation, so outputs land in the working
+    directory) and the objects are moved into obj_dir afterwards. On failure
+    the files are recompiled one by one to localize diagnostics.
+    
+    Returns the object file path (or None) for each source file, in order.
+    """
+    if len(source_files) == 1:
+        return [compile_source_to_object(compile_prefix, source_files[0], obj_dir)]
+    
+    # Paths must survive the change of working directory
+    batch_prefix = [f"-I{os.path.abspath(flag[2:])}" if flag.startswith('-I') and len(flag) > 2 else flag
+                    for flag in compile_prefix]
+    cmd = [*batch_prefix, *(os.path.abspath(source_file) for source_file in source_files)]
+    cache_dir = os.path.join(obj_dir, BUILD_CACHE_DIR)
+    
+    with tempfile.TemporaryDirectory(dir=obj_dir, prefix='.batch-') as batch_dir:
+        logger.info(f"Compiling {len(source_files)} sources in one batch: {', '.join(source_files)}")
+        returncode, _, stderr = run_command(cmd, cwd=batch_dir, capture_stdout=False)
+        
+        if returncode != 0:
+            logger.warning(f"Batch compilation failed, compiling {len(source_files)} sources individually")
+            return [compile_source_to_object(compile_prefix, source_file, obj_dir) for source_file in source_files]
+        
+        results = []
+        for source_file in source_files:
+            obj_file, dep_file = object_paths(source_file, obj_dir)
+            base_name = os.path.basename(obj_file)[:-2]  # Remove .o
+            batch_dep_file = os.path.join(batch_dir, f"{base_name}.d")
+            # Give the dependency file the target and relative paths a
+            # single-file compile writes
+            write_dep_file(batch_dep_file, obj_file, [os.path.relpath(dep) for dep in parse_dep_file(batch_dep_file)])
+            os.replace(os.path.join(batch_dir, f"{base_name}.o"), obj_file)
+            os.replace(batch_dep_file, dep_file)
+            
+            # Cache under the equivalent single-file command so both paths share entries
+            single_cmd = compile_command(compile_prefix, source_file, obj_file, dep_file)
+            record_compile_command(obj_file, single_cmd)
+            store_in_build_cache(cache_dir, compute_cache_key(single_cmd, source_file, dep_file), obj_file, dep_file)
+            
+            logger.info(f"Successfully compiled {source_file} to {obj_file}")
+            results.append(obj_file)
+    
+    return results
+
+def compile_sources(
+    compile_prefix: Tuple[str, ...],
+    source_files: List[str],
+    obj_dir: str,
+    jobs: Optional[int] = None,
+    batch: bool = True
+) -> List[Optional[str]]:
+    """
+    Compile source files to objects, skipping up-to-date or cached ones.
+    Stale sources are split into up to `jobs` batches compiled concurrently
+    (the GIL is released while waiting on the compiler subprocess). With
+    batch=False every stale source gets its own compiler invocation.
+    
+    Returns the object file path (or None) for each source file, in order.
+    """
+    ensure_directory_exists(obj_dir)
+    cache_dir = os.path.join(obj_dir, BUILD_CACHE_DIR)
+    results: Dict[str, Optional[str]] = {}
+    stale = []
+    seen_objects = set()
+    
+    for source_file in source_files:
+        obj_file, dep_file = object_paths(source_file, obj_dir)
+        cmd = compile_command(compile_prefix, source_file, obj_file, dep_file)
+        if reuse_existing_object(cmd, source_file, obj_file, dep_file, cache_dir):
+            results[source_file] = obj_file
+        elif obj_file in seen_objects:
+            # Same object name as another stale source; cannot share a batch
+            results[source_file] = compile_source_to_object(compile_prefix, source_file, obj_dir)
+        else:
+            seen_objects.add(obj_file)
+            stale.append(source_file)
+    
+    if stale:
+        worker_count = min(jobs or os.cpu_count() or 1, len(stale))
+        if batch:
+            batches = [stale[i::worker_count] for i in range(worker_count)]
+        else:
+            batches = [[source_file] for source_file in stale]
+        
+        with concurrent.futures.ThreadPoolExecutor(max_workers=worker_count) as executor:
+            for batch, batch_results in zip(batches, executor.map(
+                lambda batch: compile_batch(compile_prefix, batch, obj_dir),
+                batches
+            )):
+                results.update(zip(batch, batch_results))
+    
+    return [results[source_file] for source_file in source_files]
+
 def build_test_executable(
     compiler: str,
     test_file: str,
     obj_files: List[str],
     bin_dir: str,
-    include_flags: str,
-    lib_flags: str
+    include_flags: List[str],
+    lib_flags: List[str]
 ) -> Optional[str]:
     """
     Build a test executable from a test file and object files.
     
+    The link is skipped when a hash of the command and of all its inputs
+    (test source and headers, objects, libraries) matches the one recorded
+    next to the executable by the previous successful link.
+    
     Returns the path to the executable if successful, None otherwise.
     """
     # Create base name and executable path
@@ -103,48 +308,254 @@ def build_test_executable(
     # Create the bin directory structure if it doesn't exist
     ensure_directory_exists(os.path.dirname(test_bin))
     
-    # Construct the link command
-    obj_files_str = " ".join(obj_files)
-    cmd = f"{compiler} {test_file} {obj_files_str} -o {test_bin} {include_flags} {lib_flags}"
+    # Construct the link command; the test source is compiled here too, so
+    # record its header dependencies
+    dep_file = f"{test_bin}.d"
+    cmd = [compiler, test_file, *obj_files, "-o", test_bin, "-MMD", "-MF", dep_file, *include_flags, *lib_flags]
+    
+    # Early cutoff: skip the link if none of its inputs changed
+    key_file = f"{test_bin}.linkkey"
+    link_key = compute_link_key(cmd, test_file, dep_file, obj_files, lib_flags)
+    if link_key and os.path.exists(test_bin):
+        try:
+            with open(key_file, 'r') as f:
+                if f.read().strip() == link_key:
+                    logger.info(f"Up to date: {test_bin}")
+                    return test_bin
+        except OSError:
+            pass
     
     # Execute the link command
     logger.info(f"Building test executable: {test_bin}")
-    returncode, stdout, stderr = run_command(cmd)
+    # Only diagnostics on stderr are of interest for compiles and links
+    returncode, _, stderr = run_command(cmd, capture_stdout=False)
     
     if returncode != 0:
         logger.error(f"Link failed for {test_file}")
-        logger.error(f"Command: {cmd}")
+        logger.error(f"Command: {shlex.join(cmd)}")
         logger.error(f"Error: {stderr}")
         return None
     
+    # Record the key over the freshly written dependency file
+    link_key = compute_link_key(cmd, test_file, dep_file, obj_files, lib_flags)
+    if link_key:
+        with open(key_file, 'w') as f:
+            f.write(f"{link_key}\n")
+    
     logger.info(f"Successfully built test executable: {test_bin}")
     return test_bin
 
-def collect_dependencies(source_file: str, include_dirs: List[str]) -> List[str]:
+def parse_dep_file(dep_file: str) -> List[str]:
+    """
+    Parse a Makefile-style dependency file written by the compiler (-MMD).
+    Returns the list of prerequisites (the source file and its headers).
+    """
+    with open(dep_file, 'r') as f:
+        content = f.read().replace('\\\n', ' ')
+    
+    _, _, prerequisites = content.partition(': ')
+    return [dep.replace('\\ ', ' ') for dep in re.split(r'(?<!\\)\s+', prerequisites) if dep]
+
+def write_dep_file(dep_file: str, target: str, prerequisites: List[str]) -> None:
+    """Write a Makefile-style dependency file in the format parse_dep_file reads."""
+    target, *prerequisites = (path.replace(' ', '\\ ') for path in [target, *prerequisites])
+    with open(dep_file, 'w') as f:
+        f.write(f"{target}: {' '.join(prerequisites)}\n")
+
+def record_compile_command(obj_file: str, cmd: List[str]) -> None:
+    """Remember the command an object was built with, so a change of flags, compiler or launcher forces a rebuild."""
+    with open(f"{obj_file}.cmd", 'w') as f:
+        f.write(f"{shlex.join(cmd)}\n")
+
+def is_object_up_to_date(obj_file: str, dep_file: str, cmd: List[str]) -> bool:
     """
-    Analyze a source file to determine its dependencies.
-    Returns a list of source files that it depends on.
+    Check whether an object file was built by cmd and is newer than all
+    inputs recorded in its dependency file.
     """
-    # This is a simplified implementation
-    # A real implementation would parse include statements and map them to actual files
-    dependencies = []
+    try:
+        obj_mtime = os.path.getmtime(obj_file)
+        with open(f"{obj_file}.cmd", 'r') as f:
+            if f.read() != f"{shlex.join(cmd)}\n":
+                return False
+        inputs = parse_dep_file(dep_file)
+    except OSError:
+        return False
     
-    with open(source_file, 'r') as f:
-        for line in f:
-            if line.strip().startswith('#include "'):
-                # Extract the include file
-                include_file = line.strip().split('"')[1]
-                
-                # Look for the include file in include directories
-                for include_dir in include_dirs:
-                    potential_path = os.path.join(include_dir, include_file)
-                    if os.path.exists(potential_path):
-                        dependencies.append(potential_path)
-                        break
+    if not inputs:
+        return False
     
-    return dependencies
+    try:
+        return all(os.path.getmtime(path) <= obj_mtime for path in inputs)
+    except OSError:
+        return False
 
-def find_source_for_test(test_file: str, source_dirs: List[str]) -> Optional[str]:
+def walk_c_files(root: str) -> Iterator[str]:
+    """
+    Yield the paths of all C source files under root, files in a directory
+    before those in its subdirectories. Hidden entries are skipped.
+    """
+    subdirs = []
+    try:
+        with os.scandir(root) as entries:
+            for entry in entries:
+                if entry.name.startswith('.'):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif entry.name.endswith('.c'):
+                    yield entry.path
+    except OSError:
+        return
+    
+    for subdir in subdirs:
+        yield from walk_c_files(subdir)
+
+def build_source_index(source_dirs: List[str]) -> Dict[str, str]:
+    """
+    Map each C source file name under the source directories to its path.
+    Earlier source directories, and shallower files, take precedence.
+    """
+    source_index = {}
+    walked = []
+    for source_dir in source_dirs:
+        # A directory nested in one already walked cannot add new entries
+        abs_dir = os.path.abspath(source_dir)
+        if any(os.path.commonpath([abs_dir, done]) == done for done in walked):
+            continue
+        walked.append(abs_dir)
+        
+        for path in walk_c_files(source_dir):
+            source_index.setdefault(os.path.basename(path), path)
+    
+    return source_index
+
+@functools.lru_cache(maxsize=4096)
+def _file_digest_cached(path: str, mtime_ns: int, size: int) -> bytes:
+    """SHA-256 of a file's contents; the stat fields only serve as the cache key."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.digest()
+
+def file_digest(path: str) -> bytes:
+    """
+    Return the SHA-256 of a file's contents, memoized on (path, mtime, size)
+    so headers shared by many sources are only read once per build.
+    """
+    st = os.stat(path)
+    return _file_digest_cached(path, st.st_mtime_ns, st.st_size)
+
+def compute_cache_key(cmd: List[str], source_file: str, dep_file: str) -> Optional[str]:
+    """
+    Compute the build cache key for a compile: a SHA-256 over the command
+    line and the contents of every input recorded in the dependency file
+    (or just the source when no dependency file exists yet). Input paths are
+    hashed relative to the working directory, so absolute and relative
+    spellings of the same header give the same key.
+    """
+    try:
+        inputs = parse_dep_file(dep_file)
+    except OSError:
+        inputs = []
+    
+    digest = hashlib.sha256('\0'.join(cmd).encode())
+    try:
+        for path in inputs or [source_file]:
+            digest.update(f"\0{os.path.relpath(path)}\0".encode())
+            digest.update(file_digest(path))
+    except OSError:
+        return None
+    
+    return digest.hexdigest()
+
+def resolve_libraries(lib_flags: List[str]) -> List[str]:
+    """Resolve -l flags against the -L directories to the library files the linker would pick."""
+    lib_dirs = [flag[2:] for flag in lib_flags if flag.startswith('-L')]
+    libraries = []
+    for flag in lib_flags:
+        if not flag.startswith('-l'):
+            continue
+        for lib_dir in lib_dirs:
+            candidates = [os.path.join(lib_dir, f"lib{flag[2:]}{ext}") for ext in ('.so', '.a')]
+            found = [path for path in candidates if os.path.exists(path)]
+            if found:
+                libraries.append(found[0])
+                break
+    return libraries
+
+def compute_link_key(
+    cmd: List[str],
+    test_file: str,
+    dep_file: str,
+    obj_files: List[str],
+    lib_flags: List[str]
+) -> Optional[str]:
+    """
+    Compute the early-cutoff key for a link: a SHA-256 over the command line
+    and the contents of the test source and its headers, the object files
+    and the libraries resolved from lib_flags. Returns None if an input is
+    missing.
+    """
+    try:
+        sources = parse_dep_file(dep_file)
+    except OSError:
+        sources = []
+    
+    digest = hashlib.sha256('\0'.join(cmd).encode())
+    try:
+        for path in (sources or [test_file]) + obj_files + resolve_libraries(lib_flags):
+            digest.update(f"\0{path}\0".encode())
+            digest.update(file_digest(path))
+    except OSError:
+        return None
+    
+    return digest.hexdigest()
+
+def link_or_copy(src: str, dst: str) -> None:
+    """Hard link src to dst, copying when linking is not possible."""
+    if os.path.lexists(dst):
+        os.unlink(dst)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+def restore_from_build_cache(cache_dir: str, cache_key: Optional[str], obj_file: str, dep_file: str) -> bool:
+    """Restore an object and its dependency file from the build cache. Returns True on a hit."""
+    if cache_key is None:
+        return False
+    
+    cached_obj = os.path.join(cache_dir, f"{cache_key}.o")
+    cached_dep = os.path.join(cache_dir, f"{cache_key}.d")
+    if not (os.path.exists(cached_obj) and os.path.exists(cached_dep)):
+        return False
+    
+    try:
+        link_or_copy(cached_obj, obj_file)
+        link_or_copy(cached_dep, dep_file)
+        # Make the restored object newer than its inputs for the mtime check
+        os.utime(obj_file)
+    except OSError as e:
+        logger.debug(f"Build cache restore failed for {obj_file}: {e}")
+        return False
+    
+    return True
+
+def store_in_build_cache(cache_dir: str, cache_key: Optional[str], obj_file: str, dep_file: str) -> None:
+    """Record a freshly compiled object and its dependency file in the build cache."""
+    if cache_key is None:
+        return
+    
+    ensure_directory_exists(cache_dir)
+    try:
+        # Write the object last so a present object implies a complete entry
+        link_or_copy(dep_file, os.path.join(cache_dir, f"{cache_key}.d"))
+        link_or_copy(obj_file, os.path.join(cache_dir, f"{cache_key}.o"))
+    except OSError as e:
+        logger.debug(f"Could not store {obj_file} in build cache: {e}")
+
+def find_source_for_test(test_file: str, source_index: Dict[str, str]) -> Optional[str]:
     """Find the corresponding source file for a test file."""
     # Extract the base name without _test.c
     if test_file.endswith('_test.c'):
@@ -152,26 +563,16 @@ def find_source_for_test(test_file: str, source_dirs: List[str]) -> Optional[str
     else:
         base_name = os.path.basename(test_file)[:-2]  # Just remove .c
     
-    # Look for a matching source file in source directories
-    for source_dir in source_dirs:
-        potential_path = os.path.join(source_dir, f"{base_name}.c")
-        if os.path.exists(potential_path):
-            return potential_path
-        
-        # Also check subdirectories
-        for root, dirs, files in os.walk(source_dir):
-            potential_path = os.path.join(root, f"{base_name}.c")
-            if os.path.exists(potential_path):
-                return potential_path
-    
-    return None
+    return source_index.get(f"{base_name}.c")
 
 def process_accessibility_files(
     compiler: str, 
     source_dir: str, 
     obj_dir: str, 
     include_dirs: List[str],
-    include_flags: str
+    include_flags: List[str],
+    jobs: Optional[int] = None,
+    launcher: Optional[str] = None
 ) -> List[str]:
     """Process all accessibility module source files and return compiled object files."""
     accessibility_dir = os.path.join(source_dir, 'core', 'accessibility')
@@ -180,26 +581,20 @@ def process_accessibility_files(
         return []
     
     accessibility_sources = glob.glob(f'{accessibility_dir}/*.c')
-    obj_files = []
+    compile_prefix = make_compile_prefix(compiler, include_flags, launcher)
+    # ccache only caches single-source invocations, so do not batch behind it
+    results = compile_sources(compile_prefix, accessibility_sources, obj_dir, jobs, batch=launcher is None)
     
-    for source_file in accessibility_sources:
-        obj_file = compile_source_to_object(
-            compiler,
-            source_file,
-            obj_dir,
-            include_flags
-        )
-        if obj_file:
-            obj_files.append(obj_file)
-    
-    return obj_files
+    return [obj_file for obj_file in results if obj_file]
 
 def process_command_files(
     compiler: str,
     source_dir: str,
     obj_dir: str,
     include_dirs: List[str],
-    include_flags: str
+    include_flags: List[str],
+    jobs: Optional[int] = None,
+    launcher: Optional[str] = None
 ) -> Dict[str, str]:
     """
     Process all command files and return a dictionary mapping 
@@ -207,33 +602,55 @@ def process_command_files(
     """
     command_dir = os.path.join(source_dir, 'cli', 'commands')
     command_files = glob.glob(f'{command_dir}/*.c')
-    command_objs = {}
+    sources = []
     
     # Also compile the core command.c file
     core_command_file = os.path.join(source_dir, 'cli', 'command.c')
     if os.path.exists(core_command_file):
-        obj_file = compile_source_to_object(
-            compiler,
-            core_command_file,
-            obj_dir,
-            include_flags
-        )
-        if obj_file:
-            command_objs['command'] = obj_file
+        sources.append(('command', core_command_file))
     
     for command_file in command_files:
         base_name = os.path.basename(command_file)[:-2]  # Remove .c
-        obj_file = compile_source_to_object(
-            compiler,
-            command_file,
-            obj_dir,
-            include_flags
-        )
+        sources.append((base_name, command_file))
+    
+    compile_prefix = make_compile_prefix(compiler, include_flags, launcher)
+    results = compile_sources(
+        compile_prefix,
+        [source_file for _, source_file in sources],
+        obj_dir,
+        jobs,
+        batch=launcher is None
+    )
+    
+    command_objs = {}
+    for (name, _), obj_file in zip(sources, results):
         if obj_file:
-            command_objs[base_name] = obj_file
+            command_objs[name] = obj_file
     
     return command_objs
 
+def select_test_objects(
+    base_name: str,
+    command_objs: Dict[str, str],
+    accessibility_objs: List[str]
+) -> List[str]:
+    """Determine which object files a test for the given source must link with."""
+    required_objs = []
+    
+    # Always include the core command object if available
+    if 'command' in command_objs:
+        required_objs.append(command_objs['command'])
+    
+    # Include the specific command object if available
+    if base_name in command_objs:
+        required_objs.append(command_objs[base_name])
+    
+    # If this is an accessibility test, include all accessibility objects
+    if 'accessibility' in base_name:
+        required_objs.extend(accessibility_objs)
+    
+    return required_objs
+
 def process_test_files(
     compiler: str,
     test_dir: str,
@@ -241,16 +658,27 @@ def process_test_files(
     obj_dir: str,
     bin_dir: str,
     command_objs: Dict[str, str],
-    include_flags: str,
-    lib_flags: str
+    include_flags: List[str],
+    lib_flags: List[str],
+    jobs: Optional[int] = None,
+    accessibility_objs: Optional[List[str]] = None
 ) -> List[str]:
-    """Process all test files and return paths to built executables."""
-    test_files = glob.glob(f'{test_dir}/**/*_test.c', recursive=True)
-    built_executables = []
+    """
+    Process all test files and return paths to built executables.
+    
+    accessibility_objs are the compiled accessibility objects; when omitted
+    they are looked up once in the object directory.
+    """
+    test_files = [path for path in walk_c_files(test_dir) if path.endswith('_test.c')]
+    source_index = build_source_index(source_dirs)
+    if accessibility_objs is None:
+        accessibility_objs = glob.glob(f'{obj_dir}/core/accessibility/*.o')
     
+    # Resolve every test's link inputs up front
+    deps_by_test: Dict[str, List[str]] = {}
     for test_file in test_files:
         # Find the corresponding source file
-        source_file = find_source_for_test(test_file, source_dirs)
+        source_file = find_source_for_test(test_file, source_index)
         
         if not source_file:
             logger.warning(f"No source file found for test: {test_file}")
@@ -258,44 +686,156 @@ def process_test_files(
         
         # Determine which command objects to link with
         base_name = os.path.basename(source_file)[:-2]  # Remove .c
-        required_objs = []
-        
-        # Always include the core command object if available
-        if 'command' in command_objs:
-            required_objs.append(command_objs['command'])
-        
-        # Include the specific command object if available
-        if base_name in command_objs:
-            required_objs.append(command_objs[base_name])
-        
-        # If this is an accessibility test, include all accessibility objects
-        if 'accessibility' in base_name:
-            accessibility_objs = glob.glob(f'{obj_dir}/core/accessibility/*.o')
-            required_objs.extend(accessibility_objs)
+        deps_by_test[test_file] = select_test_objects(base_name, command_objs, accessibility_objs)
+    
+    # Build the test executables
+    with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as executor:
+        results = list(executor.map(
+            lambda test_file: build_test_executable(
+                compiler,
+                test_file,
+                deps_by_test[test_file],
+                bin_dir,
+                include_flags,
+                lib_flags
+            ),
+            deps_by_test
+        ))
+    
+    return [executable for executable in results if executable]
+
+def ninja_escape(path: str) -> str:
+    """Escape a path for use in a Ninja build statement."""
+    return path.replace('$', '$$').replace(' ', '$ ').replace(':', '$:')
+
+def emit_ninja(
+    out_path: str,
+    compiler: str,
+    compile_edges: List[Tuple[str, str]],
+    link_edges: List[Tuple[str, str, List[str]]],
+    include_flags: List[str],
+    lib_flags: List[str],
+    launcher: Optional[str] = None
+) -> None:
+    """
+    Write a Ninja build file.
+    
+    compile_edges is a list of (object, source) pairs; link_edges is a list
+    of (executable, test source, object files) triples. Header dependencies
+    are tracked by Ninja from the compiler's -MMD depfiles.
+    """
+    lines = [
+        "# Auto-generated by build_command_test.py",
+        f"cc = {compiler}",
+        f"launcher = {launcher or ''}",
+        f"cflags = {shlex.join(include_flags)}",
+        f"ldflags = {shlex.join(lib_flags)}",
+        "",
+        "rule cc",
+        "  command = $launcher $cc -MMD -MF $out.d -c $in -o $out $cflags -DUNIT_TESTING",
+        "  depfile = $out.d",
+        "  deps = gcc",
+        "  description = CC $out",
+        "",
+        "rule link",
+        "  command = $cc $in -o $out $cflags $ldflags",
+        "  description = LINK $out",
+        "",
+    ]
+    
+    for obj_file, source_file in compile_edges:
+        lines.append(f"build {ninja_escape(obj_file)}: cc {ninja_escape(source_file)}")
+    
+    for test_bin, test_file, obj_files in link_edges:
+        inputs = ' '.join(ninja_escape(path) for path in [test_file] + obj_files)
+        lines.append(f"build {ninja_escape(test_bin)}: link {inputs}")
+    
+    with open(out_path, 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+    
+    logger.info(f"Wrote Ninja build file: {out_path}")
+
+def build_with_ninja(
+    compiler: str,
+    source_dir: str,
+    test_dir: str,
+    source_dirs: List[str],
+    obj_dir: str,
+    bin_dir: str,
+    include_flags: List[str],
+    lib_flags: List[str],
+    jobs: Optional[int] = None,
+    launcher: Optional[str] = None
+) -> List[str]:
+    """
+    Describe all compile and link steps in a Ninja build file and run Ninja.
+    
+    Returns the paths to the test executables that were built.
+    """
+    def object_for(source_file: str) -> str:
+        return os.path.join(obj_dir, f"{os.path.basename(source_file)[:-2]}.o")
+    
+    compile_edges = []
+    
+    accessibility_objs = []
+    for source_file in glob.glob(os.path.join(source_dir, 'core', 'accessibility', '*.c')):
+        accessibility_objs.append(object_for(source_file))
+        compile_edges.append((accessibility_objs[-1], source_file))
+    
+    command_objs = {}
+    core_command_file = os.path.join(source_dir, 'cli', 'command.c')
+    if os.path.exists(core_command_file):
+        command_objs['command'] = object_for(core_command_file)
+        compile_edges.append((command_objs['command'], core_command_file))
+    
+    for command_file in glob.glob(os.path.join(source_dir, 'cli', 'commands', '*.c')):
+        base_name = os.path.basename(command_file)[:-2]  # Remove .c
+        command_objs[base_name] = object_for(command_file)
+        compile_edges.append((command_objs[base_name], command_file))
+    
+    source_index = build_source_index(source_dirs)
+    link_edges = []
+    for test_file in (path for path in walk_c_files(test_dir) if path.endswith('_test.c')):
+        source_file = find_source_for_test(test_file, source_index)
         
-        # Build the test executable
-        executable = build_test_executable(
-            compiler,
-            test_file,
-            required_objs,
-            bin_dir,
-            include_flags,
-            lib_flags
-        )
+        if not source_file:
+            logger.warning(f"No source file found for test: {test_file}")
+            continue
         
-        if executable:
-            built_executables.append(executable)
+        base_name = os.path.basename(source_file)[:-2]  # Remove .c
+        test_bin = os.path.join(bin_dir, os.path.basename(test_file)[:-2])
+        required_objs = select_test_objects(base_name, command_objs, accessibility_objs)
+        link_edges.append((test_bin, test_file, required_objs))
+    
+    ninja_file = os.path.join(obj_dir, 'build.ninja')
+    emit_ninja(ninja_file, compiler, compile_edges, link_edges, include_flags, lib_flags, launcher)
+    
+    # Keep going past failed edges, matching the per-file driver
+    cmd = ["ninja", "-f", ninja_file, "-k", "0"]
+    if jobs:
+        cmd.extend(["-j", str(jobs)])
+    
+    logger.info(f"Running: {shlex.join(cmd)}")
+    if subprocess.run(cmd, check=False).returncode != 0:
+        logger.error("Ninja build reported failures")
     
-    return built_executables
+    return [test_bin for test_bin, _, _ in link_edges if os.path.exists(test_bin)]
 
-def run_tests(executables: List[str]) -> bool:
-    """Run all test executables and return True if all tests pass."""
+def run_tests(executables: List[str], jobs: Optional[int] = None) -> bool:
+    """
+    Run all test executables, up to `jobs` at a time, and return True if
+    all tests pass. Results are reported in the original order.
+    """
     all_passed = True
     
-    for executable in executables:
+    def run_test(executable: str) -> Tuple[int, str, str]:
         logger.info(f"Running test: {executable}")
-        returncode, stdout, stderr = run_command(executable)
-        
+        return run_command([executable])
+    
+    with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as executor:
+        results = list(executor.map(run_test, executables))
+    
+    for executable, (returncode, stdout, stderr) in zip(executables, results):
         if returncode != 0:
             logger.error(f"Test failed: {executable}")
             logger.error(f"Output: {stdout}")
@@ -306,6 +846,35 @@ def run_tests(executables: List[str]) -> bool:
     
     return all_passed
 
+# Templates for the generated CI test runner script
+CI_RUNNER_PROLOG = """#!/bin/sh
+# Auto-generated test runner script
+
+FAILURES=0
+
+"""
+
+CI_RUNNER_TEST_TEMPLATE = """echo "Running {name}..."
+{executable}
+if [ $? -ne 0 ]; then
+    echo "FAILED: ${{executable}}"
+    FAILURES=$((FAILURES+1))
+else
+    echo "PASSED: ${{executable}}"
+fi
+echo ""
+
+"""
+
+CI_RUNNER_EPILOG = """if [ $FAILURES -eq 0 ]; then
+    echo "All tests passed!"
+    exit 0
+else
+    echo "$FAILURES test(s) failed!"
+    exit 1
+fi
+"""
+
 def create_ci_artifacts(
     executables: List[str],
     ci_dir: str
@@ -316,34 +885,18 @@ def create_ci_artifacts(
     # Create a test list file
     test_list_file = os.path.join(ci_dir, 'test_list.txt')
     with open(test_list_file, 'w') as f:
-        for executable in executables:
-            f.write(f"{executable}\n")
+        f.write(''.join(f"{executable}\n" for executable in executables))
     
-    # Create a run tests script
+    # Create a run tests script, assembled from templates and written once
     run_tests_script = os.path.join(ci_dir, 'run_tests.sh')
+    parts = [CI_RUNNER_PROLOG]
+    parts.extend(
+        CI_RUNNER_TEST_TEMPLATE.format(name=os.path.basename(executable), executable=executable)
+        for executable in executables
+    )
+    parts.append(CI_RUNNER_EPILOG)
     with open(run_tests_script, 'w') as f:
-        f.write("#!/bin/sh\n")
-        f.write("# Auto-generated test runner script\n\n")
-        f.write("FAILURES=0\n\n")
-        
-        for executable in executables:
-            f.write(f"echo \"Running {os.path.basename(executable)}...\"\n")
-            f.write(f"{executable}\n")
-            f.write("if [ $? -ne 0 ]; then\n")
-            f.write("    echo \"FAILED: ${executable}\"\n")
-            f.write("    FAILURES=$((FAILURES+1))\n")
-            f.write("else\n")
-            f.write("    echo \"PASSED: ${executable}\"\n")
-            f.write("fi\n")
-            f.write("echo \"\"\n\n")
-        
-        f.write("if [ $FAILURES -eq 0 ]; then\n")
-        f.write("    echo \"All tests passed!\"\n")
-        f.write("    exit 0\n")
-        f.write("else\n")
-        f.write("    echo \"$FAILURES test(s) failed!\"\n")
-        f.write("    exit 1\n")
-        f.write("fi\n")
+        f.write(''.join(parts))
     
     # Make the script executable
     os.chmod(run_tests_script, 0o755)
@@ -361,6 +914,10 @@ def main():
     parser.add_argument('--libs', default='polycall_core', help='Comma-separated list of libraries to link against')
     parser.add_argument('--run-tests', action='store_true', help='Run tests after building')
     parser.add_argument('--create-ci-artifacts', action='store_true', help='Create CI artifacts')
+    parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count(), help='Number of parallel compile/link jobs')
+    parser.add_argument('--test-jobs', type=int, default=os.cpu_count(), help='Number of test executables to run in parallel')
+    parser.add_argument('--no-ccache', action='store_true', help='Do not wrap compiles with ccache even if it is installed')
+    parser.add_argument('--ninja', action='store_true', help='Generate a Ninja build file and let Ninja drive the build')
     parser.add_argument('--verbose', '-v', action='store_true', help='Enable verbose output')
     parser.add_argument('--clean', action='store_true', help='Clean build directories before building')
     args = parser.parse_args()
@@ -385,48 +942,76 @@ def main():
     compiler = detect_compiler()
     logger.info(f"Using compiler: {compiler}")
     
+    launcher = detect_compiler_launcher(not args.no_ccache)
+    if launcher:
+        logger.info(f"Using compiler launcher: {launcher}")
+    
     # Parse include directories
     include_dirs = args.include_dirs.split(',')
-    include_flags = ' '.join([f'-I{dir}' for dir in include_dirs])
+    include_flags = [f'-I{dir}' for dir in include_dirs]
     
     # Parse library directories and libraries
     lib_dirs = args.lib_dirs.split(',')
     libs = args.libs.split(',')
-    lib_flags = ' '.join([f'-L{dir}' for dir in lib_dirs] + [f'-l{lib}' for lib in libs])
-    
-    # Process accessibility files
-    accessibility_objs = process_accessibility_files(
-        compiler,
-        args.source_dir,
-        args.obj_dir,
-        include_dirs,
-        include_flags
-    )
-    
-    # Process command files
-    command_objs = process_command_files(
-        compiler,
-        args.source_dir,
-        args.obj_dir,
-        include_dirs,
-        include_flags
-    )
+    lib_flags = [f'-L{dir}' for dir in lib_dirs] + [f'-l{lib}' for lib in libs]
     
     # Resolve source directories to search for matching source files
     source_dirs = [args.source_dir]
     source_dirs.extend([os.path.join(args.source_dir, subdir) for subdir in ['cli', 'core']])
     
-    # Process test files
-    built_executables = process_test_files(
-        compiler,
-        args.test_dir,
-        source_dirs,
-        args.obj_dir,
-        args.bin_dir,
-        command_objs,
-        include_flags,
-        lib_flags
-    )
+    if args.ninja and not shutil.which("ninja"):
+        logger.warning("ninja not found, falling back to the built-in build driver")
+        args.ninja = False
+    
+    if args.ninja:
+        built_executables = build_with_ninja(
+            compiler,
+            args.source_dir,
+            args.test_dir,
+            source_dirs,
+            args.obj_dir,
+            args.bin_dir,
+            include_flags,
+            lib_flags,
+            args.jobs,
+            launcher
+        )
+    else:
+        # Process accessibility files
+        accessibility_objs = process_accessibility_files(
+            compiler,
+            args.source_dir,
+            args.obj_dir,
+            include_dirs,
+            include_flags,
+            args.jobs,
+            launcher
+        )
+        
+        # Process command files
+        command_objs = process_command_files(
+            compiler,
+            args.source_dir,
+            args.obj_dir,
+            include_dirs,
+            include_flags,
+            args.jobs,
+            launcher
+        )
+        
+        # Process test files
+        built_executables = process_test_files(
+            compiler,
+            args.test_dir,
+            source_dirs,
+            args.obj_dir,
+            args.bin_dir,
+            command_objs,
+            include_flags,
+            lib_flags,
+            args.jobs,
+            accessibility_objs
+        )
     
     # Create CI artifacts if requested
     if args.create_ci_artifacts:
@@ -437,7 +1022,7 @@ def main():
     
     # Run tests if requested
     if args.run_tests:
-        all_passed = run_tests(built_executables)
+        all_passed = run_tests(built_executables, args.test_jobs)
         if all_passed:
             logger.info("All tests passed!")
             return 0
@@ -19,6 +19,7 @@ import sys
 import subprocess
 import glob
 import argparse
+import concurrent.futures
 
 def main():
     parser = argparse.ArgumentParser(description='Build command tests for LibPolyCall')
@@ -26,6 +27,7 @@ def main():
     parser.add_argument('--obj-dir', default='obj/commands', help='Output directory for object files')
     parser.add_argument('--test-dir', default='tests/unit/cli/commands', help='Directory containing test files')
     parser.add_argument('--include-dirs', default='include,src', help='Comma-separated list of include directories')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count(), help='Number of files to compile in parallel')
     args = parser.parse_args()
     
     # Create output directory if it doesn't exist
@@ -33,17 +35,30 @@ def main():
     
     # Get include directories
     include_dirs = args.include_dirs.split(',')
-    include_flags = ' '.join([f'-I{dir}' for dir in include_dirs])
+    include_flags = [f'-I{dir}' for dir in include_dirs]
     
-    # Compile each command file to object file
+    # Compile each command file to object file; the compilations are
+    # independent, so they run in parallel and are checked in order
     command_files = glob.glob(f'{args.source_dir}/*.c')
-    for command_file in command_files:
-        base_name = os.path.basename(command_file)[:-2]  # Remove .c
-        obj_file = f'{args.obj_dir}/{base_name}.o'
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, args.jobs or 1)) as executor:
+        compiles = []
+        for command_file in command_files:
+            base_name = os.path.basename(command_file)[:-2]  # Remove .c
+            obj_file = f'{args.obj_dir}/{base_name}.o'
+            
+            cmd = ['gcc', '-c', command_file, '-o', obj_file, *include_flags, '-DUNIT_TESTING']
+            print(f'Compiling {command_file} to {obj_file}...')
+            compiles.append(executor.submit(subprocess.run, cmd, check=True))
         
-        cmd = f'gcc -c {command_file} -o {obj_file} {include_flags} -DUNIT_TESTING'
-        print(f'Compiling {command_file} to {obj_file}...')
-        subprocess.run(cmd, shell=True, check=True)
+        try:
+            for compile_result in compiles:
+                compile_result.result()
+        except subprocess.CalledProcessError:
+            # Stop at the first failure as the serial build did: drop the
+            # compiles not yet started and let the running ones finish
+            for compile_result in compiles:
+                compile_result.cancel()
+            raise
     
     # Build unit tests if they exist
     test_files = glob.glob(f'{args.test_dir}/*_test.c')
@@ -60,9 +75,9 @@ def main():
             continue
         
         # Link test executable
-        cmd = f'gcc {test_file} {obj_file} -o {test_bin} {include_flags} -L. -lpolycall_core -lpolycall_accessibility'
+        cmd = ['gcc', test_file, obj_file, '-o', test_bin, *include_flags, '-L.', '-lpolycall_core', '-lpolycall_accessibility']
         print(f'Building test {test_bin}...')
-        subprocess.run(cmd, shell=True, check=True)
+        subprocess.run(cmd, check=True)
 
 if __name__ == '__main__':
     try:
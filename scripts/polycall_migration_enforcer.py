@@ -34,6 +34,10 @@ class PolyCallMigrationEnforcer:
             "protocol", "network", "auth", "ffi", "bridges", "hotwire"
         , "config", "parser", "schema", "factory", "accessibility", "repl"}
         
+        # Patterns used per file, compiled once
+        self._name_re = re.compile(r'(\w+)$')
+        self._inc_re = re.compile(r'#include\s*[<"]([^>"]+)[>"]')
+        
         self.violations = []
         self.fixes_applied = []
         
@@ -151,9 +155,8 @@ class PolyCallMigrationEnforcer:
 
 """
         
-        # Add function implementations
-        for func in functions:
-            content += self._generate_function_stub(func)
+        # Add function implementations, joined once and written in a single call
+        content += "".join(self._generate_function_stub(func) for func in functions)
             
         source_file.write_text(content)
         print(f"  Generated: {source_file}")
@@ -162,12 +165,104 @@ class PolyCallMigrationEnforcer:
         """Extract function declarations from header"""
         content = header_file.read_text()
         
-        # Simple regex to find function declarations
-        func_pattern = r'^\s*(?:static\s+)?(?:inline\s+)?(?:const\s+)?(?:\w+\s+)*\*?\s*(\w+)\s*\([^)]*\)\s*;'
-        functions = re.findall(func_pattern, content, re.MULTILINE)
+        functions = []
+        for statement in self._scan_declarations(content):
+            # Only prototypes: `<type> name(<params>)`, no typedefs or initializers
+            if not statement.endswith(')') or statement.startswith('typedef') or '=' in statement:
+                continue
+            # The name is the identifier right before the first '(', and it
+            # must be preceded by a return type
+            head = statement[:statement.find('(')].rstrip()
+            match = self._name_re.search(head)
+            if not match or not head[:match.start()].strip():
+                continue
+            if match.group(1) not in ('if', 'while', 'for', 'switch', 'return', 'sizeof'):
+                functions.append(match.group(1))
         
         return functions
         
+    def _scan_declarations(self, content: str) -> List[str]:
+        """
+        Split C source into top-level statements terminated by ';'.
+        
+        Single linear pass: comments, string/char literals and preprocessor
+        lines are dropped, and anything inside braces is skipped except for
+        `extern "C" { ... }` linkage blocks. Top-level function definitions
+        (e.g. static inline helpers) end at their closing brace and are not
+        reported.
+        """
+        statements = []
+        current = []
+        depth = 0
+        # One entry per open brace: True for a transparent linkage block
+        braces = []
+        # Whether the outermost open body belongs to a function definition
+        in_definition = False
+        i = 0
+        n = len(content)
+        at_line_start = True
+        
+        while i < n:
+            c = content[i]
+            
+            if at_line_start and c == '#':
+                # Preprocessor directive, honouring line continuations
+                while i < n and not (content[i] == '\n' and content[i - 1] != '\\'):
+                    i += 1
+                continue
+            
+            if c == '/' and content.startswith('//', i):
+                i = content.find('\n', i)
+                i = n if i < 0 else i
+                continue
+            
+            if c == '/' and content.startswith('/*', i):
+                i = content.find('*/', i + 2)
+                i = n if i < 0 else i + 2
+                current.append(' ')
+                continue
+            
+            if c in '"\'':
+                # Skip the literal, honouring escapes; literals cannot span lines
+                i += 1
+                while i < n and content[i] != c and content[i] != '\n':
+                    i += 2 if content[i] == '\\' else 1
+                if i < n and content[i] == c:
+                    i += 1
+                current.append(' ')
+                continue
+            
+            if c == '\n':
+                at_line_start = True
+            elif not c.isspace():
+                at_line_start = False
+            
+            if c == '{':
+                linkage = depth == 0 and ''.join(current).split()[-1:] == ['extern']
+                braces.append(linkage)
+                if linkage:
+                    current = []
+                else:
+                    if depth == 0:
+                        in_definition = ''.join(current).rstrip().endswith(')')
+                    depth += 1
+            elif c == '}':
+                if braces and not braces.pop():
+                    depth -= 1
+                    if depth == 0 and in_definition:
+                        current = []
+                        in_definition = False
+            elif depth == 0:
+                if c == ';':
+                    statements.append(' '.join(''.join(current).split()))
+                    current = []
+                else:
+                    current.append(c)
+            
+            i += 1
+        
+        return statements
+        
     def _generate_function_stub(self, func_name: str) -> str:
         """Generate stub implementation for function"""
         return f"""
@@ -206,11 +301,12 @@ void {func_name}_stub(void) {{
                 
     def _check_file_dependencies(self, source_file: Path, module: str):
         """Check single file for improper dependencies"""
-        content = source_file.read_text()
-        
-        # Find all includes
-        include_pattern = r'#include\s*[<"]([^>"]+)[>"]'
-        includes = re.findall(include_pattern, content)
+        # Find all includes, streaming the file line by line
+        includes = []
+        with open(source_file, 'r') as f:
+            for line in f:
+                if '#include' in line:
+                    includes.extend(self._inc_re.findall(line))
         
         for include in includes:
             # Check if it includes another command module
@@ -0,0 +1,37 @@
+"""
+Migration Enforcer Tests
+Header prototype extraction
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from polycall_migration_enforcer import PolyCallMigrationEnforcer
+
+HEADER = """\
+#ifndef POLYCALL_FOO_H
+#define POLYCALL_FOO_H
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+typedef struct { int a; } polycall_foo_t;
+
+static inline int helper(int a) { if (a) { return 1; } return a; }
+
+int polycall_foo(polycall_foo_t *foo);
+
+#ifdef __cplusplus
+}
+#endif
+#endif
+"""
+
+def test_inline_definition_before_prototype(tmp_path):
+    """An inline definition is skipped and does not swallow the next prototype"""
+    header = tmp_path / "polycall_foo.h"
+    header.write_text(HEADER)
+    enforcer = PolyCallMigrationEnforcer(str(tmp_path))
+    assert enforcer._extract_functions(header) == ["polycall_foo"]